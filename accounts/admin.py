@@ -5,6 +5,7 @@ Admin configuration for accounts app.
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
+from securebank.pagination import EstimatedCountPaginator
 from .models import User, UserProfile, BankAccount, SecuritySettings, LoginAttempt
 
 
@@ -88,6 +89,7 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "kyc_status", "country", "currency", "created_at")
     list_filter = ("kyc_status", "gender", "country", "currency")
     search_fields = ("user__email", "user__first_name", "user__last_name")
+    list_select_related = ("user",)
     readonly_fields = (
         "kyc_submitted_at",
         "kyc_verified_at",
@@ -151,6 +153,7 @@ class BankAccountAdmin(admin.ModelAdmin):
     )
     list_filter = ("account_type", "currency", "status", "is_default")
     search_fields = ("account_number", "account_name", "user__email")
+    list_select_related = ("user",)
     readonly_fields = ("id", "created_at", "updated_at")
 
     fieldsets = (
@@ -187,6 +190,7 @@ class SecuritySettingsAdmin(admin.ModelAdmin):
         "require_otp_for_transactions",
     )
     search_fields = ("user__email",)
+    list_select_related = ("user",)
     readonly_fields = ("created_at", "updated_at")
 
 
@@ -196,6 +200,8 @@ class LoginAttemptAdmin(admin.ModelAdmin):
     list_filter = ("success", "timestamp")
     search_fields = ("email", "ip_address")
     readonly_fields = ("timestamp",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def has_add_permission(self, request):
         return False
@@ -40,7 +40,8 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return UserProfile.objects.filter(user=self.request.user)
+        queryset = UserProfile.objects.filter(user=self.request.user)
+        return self.get_serializer_class().setup_eager_loading(queryset)
 
 
 class BankAccountViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,25 @@
+"""
+Login-attempt auditing for SecureBank.
+"""
+
+from django.db import transaction
+
+from .models import LoginAttempt
+
+
+def record(
+    email, ip_address, user=None, user_agent="", success=False, failure_reason=""
+):
+    """
+    Write a login attempt once the current transaction commits, or at once
+    when no transaction is open.
+    """
+    attempt = LoginAttempt(
+        user=user,
+        email=email,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        success=success,
+        failure_reason=failure_reason,
+    )
+    transaction.on_commit(attempt.save)
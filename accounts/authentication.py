@@ -2,32 +2,96 @@
 Custom authentication backends for SecureBank.
 """
 
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+
 try:
     import jwt
 except ImportError:
     jwt = None
 
+from cachetools import TTLCache
 from django.conf import settings
-from django.contrib.auth.backends import BaseBackend
+from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
 User = get_user_model()
 
+# Verified tokens are cached briefly so polling clients don't pay for the
+# signature check on every request. Only (user_id, expires_at) is kept; the
+# user is still loaded and its active/locked status checked each time.
+JWT_CACHE_TTL = 5
+_jwt_cache = TTLCache(maxsize=10000, ttl=JWT_CACHE_TTL)
+# user_id -> digests of that user's cached tokens, so invalidation is a
+# lookup rather than a scan. Refreshed on every insert, so it outlives them.
+_jwt_cache_keys = TTLCache(maxsize=10000, ttl=JWT_CACHE_TTL)
+_jwt_cache_lock = threading.Lock()
+
+
+def _decode(token):
+    """
+    Verify token against the current signing key and required claims.
+    """
+    return jwt.decode(
+        token,
+        key=settings.SECRET_KEY,
+        algorithms=["HS256"],
+        options={"require": ["exp", "user_id"]},
+    )
+
+
+def _cache_token(cache_key, user_id, expires_at):
+    user_id = str(user_id)
+    with _jwt_cache_lock:
+        _jwt_cache[cache_key] = (user_id, expires_at)
+        _jwt_cache_keys[user_id] = _jwt_cache_keys.get(user_id, frozenset()) | {
+            cache_key
+        }
+
+
+def forget_cached_tokens(user_id):
+    """
+    Drop the cached verifications of every token issued to user_id.
+    """
+    with _jwt_cache_lock:
+        for cache_key in _jwt_cache_keys.pop(str(user_id), ()):
+            _jwt_cache.pop(cache_key, None)
+
 
-class EmailBackend(BaseBackend):
+@receiver(post_save, sender=User)
+def invalidate_jwt_cache(sender, instance, **kwargs):
+    """
+    Drop cached tokens for a user whenever the user is saved
+    (password change, deactivation, lockout).
+    """
+    forget_cached_tokens(instance.pk)
+
+
+class EmailBackend(ModelBackend):
     """
     Custom authentication backend that allows users to log in using their email address.
     """
 
-    def authenticate(self, request, username=None, password=None, **kwargs):
+    def authenticate(self, request, username=None, password=None, now=None, **kwargs):
         try:
-            user = User.objects.get(email=username)
-            if user.check_password(password) and self.user_can_authenticate(user):
+            # Only the columns needed for the login decision; login() itself
+            # writes back with update_fields, so deferred fields stay unloaded.
+            user = User.objects.only(
+                "id", "password", "is_active", "account_locked_until"
+            ).get(email=username)
+            if user.check_password(password) and self.user_can_authenticate(user, now):
                 return user
         except User.DoesNotExist:
+            # Run the password hasher anyway so an unknown email takes as
+            # long as a wrong password and can't be told apart by timing.
+            User().set_password(password)
             return None
         return None
 
@@ -40,16 +104,17 @@ class EmailBackend(BaseBackend):
         except User.DoesNotExist:
             return None
 
-    def user_can_authenticate(self, user):
+    def user_can_authenticate(self, user, now=None):
         """
         Reject users with is_active=False and check if account is locked.
+        Pass now to check the lockout against the request's timestamp.
         """
         is_active = getattr(user, "is_active", False)
         if not is_active:
             return False
 
         # Check if account is locked
-        if user.is_account_locked():
+        if user.is_account_locked(now):
             return False
 
         return True
@@ -67,13 +132,27 @@ class JWTAuthentication(BaseAuthentication):
             return None
 
         token = auth_header.split(" ")[1]
+        cache_key = hashlib.sha256(token.encode()).digest()
 
-        try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-            user_id = payload.get("user_id")
+        with _jwt_cache_lock:
+            cached = _jwt_cache.get(cache_key)
 
-            if not user_id:
-                raise AuthenticationFailed("Token payload invalid")
+        try:
+            if cached is not None and cached[1] > time.time():
+                user_id = cached[0]
+            else:
+                payload = _decode(token)
+                user_id = payload.get("user_id")
+
+                if not user_id:
+                    raise AuthenticationFailed("Token payload invalid")
+
+                # Never serve a cached entry past the token's own expiry.
+                _cache_token(
+                    cache_key,
+                    user_id,
+                    min(payload["exp"], time.time() + JWT_CACHE_TTL),
+                )
 
             user = User.objects.get(id=user_id)
 
@@ -113,13 +192,14 @@ def generate_jwt_token(user):
     """
     Generate JWT token for authenticated user.
     """
+    now = datetime.utcnow()
     payload = {
         "user_id": str(user.id),
         "email": user.email,
         "is_staff": user.is_staff,
         "is_verified": user.is_verified,
-        "exp": jwt.datetime.datetime.utcnow() + jwt.datetime.timedelta(hours=24),
-        "iat": jwt.datetime.datetime.utcnow(),
+        "exp": now + timedelta(hours=24),
+        "iat": now,
     }
 
     return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
@@ -130,7 +210,7 @@ def refresh_jwt_token(token):
     Refresh JWT token if it's still valid.
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        payload = _decode(token)
         user_id = payload.get("user_id")
 
         if not user_id:
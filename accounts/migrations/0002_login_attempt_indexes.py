@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="loginattempt",
+            index=models.Index(
+                fields=["email", "-timestamp"], name="accounts_lo_email_02dff7_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loginattempt",
+            index=models.Index(
+                fields=["ip_address", "-timestamp"],
+                name="accounts_lo_ip_addr_82ce5a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loginattempt",
+            index=models.Index(
+                fields=["success", "-timestamp"], name="accounts_lo_success_d2ca25_idx"
+            ),
+        ),
+    ]
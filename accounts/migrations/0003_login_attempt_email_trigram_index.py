@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:02
+
+from django.db import migrations
+
+INDEX_NAME = "accounts_lo_email_trgm_idx"
+
+
+def create_trigram_index(apps, schema_editor):
+    # Admin search runs UPPER(email::text) LIKE UPPER(%s); index that
+    # expression so the search can use the trigram index.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON accounts_login_attempt "
+        "USING gin (UPPER(email::text) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_login_attempt_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
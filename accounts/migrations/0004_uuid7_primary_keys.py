@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:04
+
+import uuid6
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_login_attempt_email_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="bankaccount",
+            name="id",
+            field=models.UUIDField(
+                default=uuid6.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=uuid6.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+    ]
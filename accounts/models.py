@@ -3,12 +3,16 @@ Custom User model and account management for SecureBank.
 Enhanced security with proper user roles and account types.
 """
 
-import uuid
+import secrets
+from datetime import timedelta
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, Q, Value, When
 from django.core.validators import RegexValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
+from uuid6 import uuid7
 
 
 class User(AbstractUser):
@@ -16,7 +20,7 @@ class User(AbstractUser):
     Custom user model with enhanced security features.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     email = models.EmailField(_("email address"), unique=True)
     phone_number = models.CharField(
         _("phone number"),
@@ -51,6 +55,9 @@ class User(AbstractUser):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username", "first_name", "last_name"]
 
+    MAX_FAILED_LOGIN_ATTEMPTS = 5
+    LOCKOUT_DURATION = timedelta(minutes=15)
+
     class Meta:
         verbose_name = _("User")
         verbose_name_plural = _("Users")
@@ -63,10 +70,55 @@ class User(AbstractUser):
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
 
-    def is_account_locked(self):
-        from django.utils import timezone
+    @classmethod
+    def register_failed_login(cls, email):
+        """
+        Count a failed login for email in a single UPDATE, locking the
+        account once MAX_FAILED_LOGIN_ATTEMPTS is reached.
+        """
+        user_id = cls.objects.filter(email=email).values_list("pk", flat=True).first()
+        if user_id is None:
+            return 0
+        # update() skips post_save, so drop the user's cached API tokens here
+        from .authentication import forget_cached_tokens
+
+        forget_cached_tokens(user_id)
+        # The When condition sees the pre-increment value.
+        return cls.objects.filter(pk=user_id).update(
+            failed_login_attempts=F("failed_login_attempts") + 1,
+            account_locked_until=Case(
+                When(
+                    failed_login_attempts__gte=cls.MAX_FAILED_LOGIN_ATTEMPTS - 1,
+                    then=Value(timezone.now() + cls.LOCKOUT_DURATION),
+                ),
+                default=F("account_locked_until"),
+            ),
+        )
 
-        return self.account_locked_until and self.account_locked_until > timezone.now()
+    @classmethod
+    def is_email_locked(cls, email, now=None):
+        """Check whether the account for email is inside a lockout window."""
+        return cls.objects.filter(
+            email=email, account_locked_until__gt=now or timezone.now()
+        ).exists()
+
+    def clear_failed_logins(self):
+        """Reset the failed login counter and lockout after a successful login."""
+        User.objects.filter(
+            Q(failed_login_attempts__gt=0) | Q(account_locked_until__isnull=False),
+            pk=self.pk,
+        ).update(failed_login_attempts=0, account_locked_until=None)
+        self.failed_login_attempts = 0
+        self.account_locked_until = None
+
+    def is_account_locked(self, now=None):
+        """
+        Check whether the account is inside a lockout window. Pass now to
+        reuse a timestamp the caller already has.
+        """
+        if not self.account_locked_until:
+            return False
+        return self.account_locked_until > (now or timezone.now())
 
 
 class UserProfile(models.Model):
@@ -165,7 +217,7 @@ class BankAccount(models.Model):
         ("SUSPENDED", _("Suspended")),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="accounts")
     account_number = models.CharField(_("account number"), max_length=20, unique=True)
     account_name = models.CharField(_("account name"), max_length=100)
@@ -208,19 +260,31 @@ class BankAccount(models.Model):
     def __str__(self):
         return f"{self.account_number} - {self.account_name}"
 
+    ACCOUNT_NUMBER_RETRIES = 5
+
     def save(self, *args, **kwargs):
-        if not self.account_number:
+        if self.account_number:
+            return super().save(*args, **kwargs)
+
+        # Let the unique constraint catch the rare collision instead of
+        # checking for the number before inserting it.
+        for attempt in range(self.ACCOUNT_NUMBER_RETRIES):
             self.account_number = self.generate_account_number()
-        super().save(*args, **kwargs)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                # Only a clash on the generated number is worth another try
+                collided = BankAccount.objects.filter(
+                    account_number=self.account_number
+                ).exists()
+                self.account_number = ""
+                if not collided or attempt == self.ACCOUNT_NUMBER_RETRIES - 1:
+                    raise
 
     def generate_account_number(self):
-        """Generate unique account number."""
-        import random
-
-        while True:
-            number = f"209{random.randint(1000000000, 9999999999)}"
-            if not BankAccount.objects.filter(account_number=number).exists():
-                return number
+        """Generate a random account number; uniqueness is enforced on save."""
+        return f"209{secrets.randbelow(10**10):010d}"
 
     @property
     def is_active(self):
@@ -310,6 +374,11 @@ class LoginAttempt(models.Model):
         verbose_name_plural = _("Login Attempts")
         db_table = "accounts_login_attempt"
         ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["email", "-timestamp"]),
+            models.Index(fields=["ip_address", "-timestamp"]),
+            models.Index(fields=["success", "-timestamp"]),
+        ]
 
     def __str__(self):
         return f"{self.email} - {self.timestamp} - {'Success' if self.success else 'Failed'}"
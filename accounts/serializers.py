@@ -4,7 +4,8 @@ Serializers for accounts app.
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import UserProfile, BankAccount, Beneficiary
+from transactions.models import Beneficiary
+from .models import UserProfile, BankAccount
 
 User = get_user_model()
 
@@ -38,6 +39,11 @@ class UserSerializer(serializers.ModelSerializer):
 class UserProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the nested user so listing profiles stays a single query."""
+        return queryset.select_related("user")
+
     class Meta:
         model = UserProfile
         fields = [
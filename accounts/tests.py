@@ -1,3 +1,240 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import check_password
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+
+from . import audit, authentication
+from .authentication import JWTAuthentication, generate_jwt_token
+from .models import BankAccount, LoginAttempt, User
+from .validators import KYCDocumentValidator
+from .views import LoginView
+
+
+class JWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="api", email="api@example.com", password="pw"
+        )
+
+    def setUp(self):
+        authentication._jwt_cache.clear()
+        authentication._jwt_cache_keys.clear()
+        self.token = generate_jwt_token(self.user)
+
+    def authenticate(self, token=None):
+        request = RequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token or self.token}"
+        )
+        return JWTAuthentication().authenticate(request)
+
+    def test_repeat_requests_verify_the_signature_once(self):
+        with mock.patch.object(
+            authentication, "_decode", wraps=authentication._decode
+        ) as decode:
+            self.assertEqual(self.authenticate()[0], self.user)
+            self.assertEqual(self.authenticate()[0], self.user)
+        self.assertEqual(decode.call_count, 1)
+
+    def test_cached_token_rechecks_active_status(self):
+        self.authenticate()
+        # update() sends no post_save, so only the re-check can catch this
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaisesMessage(AuthenticationFailed, "disabled"):
+            self.authenticate()
+
+    def test_cached_token_rechecks_lockout(self):
+        self.authenticate()
+        for _attempt in range(User.MAX_FAILED_LOGIN_ATTEMPTS):
+            User.register_failed_login(self.user.email)
+        with self.assertRaisesMessage(AuthenticationFailed, "locked"):
+            self.authenticate()
+
+    def test_failed_login_drops_cached_tokens(self):
+        self.authenticate()
+        self.assertEqual(len(authentication._jwt_cache), 1)
+        User.register_failed_login(self.user.email)
+        self.assertEqual(len(authentication._jwt_cache), 0)
+
+    def test_saving_the_user_drops_only_their_tokens(self):
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="pw"
+        )
+        self.authenticate()
+        self.authenticate(generate_jwt_token(other))
+        self.user.save()
+        self.assertEqual(list(authentication._jwt_cache.values())[0][0], str(other.pk))
+
+    def test_signing_key_is_read_per_call(self):
+        with override_settings(SECRET_KEY="rotated-signing-key-" + "x" * 32):
+            with self.assertRaisesMessage(AuthenticationFailed, "Invalid token"):
+                self.authenticate()
+
+
+class LoginViewTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="member", email="member@example.com", password="right-pw"
+        )
+
+    def post_login(self, password, email="member@example.com"):
+        request = RequestFactory().post(
+            "/login/", {"email": email, "password": password}
+        )
+        SessionMiddleware(lambda request: None).process_request(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = LoginView.as_view()(request)
+        return json.loads(response.content)
+
+
+class EmailBackendTests(LoginViewTestMixin, TestCase):
+    def test_authenticate_uses_the_email_backend(self):
+        user = authenticate(None, username="member@example.com", password="right-pw")
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.backend, "accounts.authentication.EmailBackend")
+
+    def test_locked_account_cannot_authenticate(self):
+        User.objects.filter(pk=self.user.pk).update(
+            account_locked_until=timezone.now() + timedelta(minutes=5)
+        )
+        self.assertIsNone(
+            authenticate(None, username="member@example.com", password="right-pw")
+        )
+
+    def test_lockout_is_checked_at_the_given_time(self):
+        User.objects.filter(pk=self.user.pk).update(
+            account_locked_until=timezone.now() + timedelta(minutes=5)
+        )
+        later = timezone.now() + timedelta(minutes=10)
+        self.assertFalse(User.is_email_locked("member@example.com", later))
+        self.assertEqual(
+            authenticate(
+                None, username="member@example.com", password="right-pw", now=later
+            ),
+            self.user,
+        )
+
+
+class LoginAuditTests(LoginViewTestMixin, TestCase):
+    def test_attempts_are_written_before_the_response(self):
+        self.post_login("wrong-pw")
+        self.post_login("right-pw")
+        self.assertQuerySetEqual(
+            LoginAttempt.objects.order_by("timestamp", "pk"),
+            [(False, "Invalid credentials"), (True, "")],
+            transform=lambda a: (a.success, a.failure_reason),
+        )
+        self.assertEqual(LoginAttempt.objects.filter(user=self.user).count(), 1)
+
+    def test_attempt_waits_for_the_transaction_to_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                audit.record(email="member@example.com", ip_address="127.0.0.1")
+                self.assertFalse(LoginAttempt.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertTrue(LoginAttempt.objects.exists())
+
+
+class LoginLockoutTests(LoginViewTestMixin, TestCase):
+    def lock_out(self):
+        for _attempt in range(User.MAX_FAILED_LOGIN_ATTEMPTS):
+            self.post_login("wrong-pw")
+
+    def test_failed_logins_count_atomically(self):
+        User.register_failed_login(self.user.email)
+        User.register_failed_login(self.user.email)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.failed_login_attempts, 2)
+        self.assertIsNone(self.user.account_locked_until)
+
+    def test_unknown_email_is_ignored(self):
+        self.assertEqual(User.register_failed_login("nobody@example.com"), 0)
+
+    def test_locks_after_max_attempts(self):
+        self.lock_out()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_account_locked())
+
+    def test_locked_account_rejects_the_right_password(self):
+        self.lock_out()
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", wraps=check_password
+        ) as hasher:
+            response = self.post_login("right-pw")
+        # The hasher still runs, so the lockout cannot be told apart by timing
+        hasher.assert_called_once()
+        self.assertEqual(response, self.post_login("wrong-pw"))
+        self.assertEqual(response, {"success": False, "message": "Invalid credentials"})
+        self.assertEqual(
+            LoginAttempt.objects.filter(failure_reason="Account locked").count(), 2
+        )
+
+    def test_success_clears_counter_and_expired_lock(self):
+        self.lock_out()
+        User.objects.filter(pk=self.user.pk).update(
+            account_locked_until=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertTrue(self.post_login("right-pw")["success"])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.failed_login_attempts, 0)
+        self.assertIsNone(self.user.account_locked_until)
+
+
+class BankAccountNumberTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="saver", email="saver@example.com", password="pw"
+        )
+        cls.existing = BankAccount.objects.create(user=cls.user)
+
+    def test_retries_when_the_number_is_taken(self):
+        numbers = [self.existing.account_number, "1234567890"]
+        with mock.patch.object(
+            BankAccount, "generate_account_number", side_effect=numbers
+        ):
+            account = BankAccount.objects.create(user=self.user)
+        self.assertEqual(account.account_number, "1234567890")
+
+    def test_other_integrity_errors_are_not_retried(self):
+        with mock.patch.object(
+            BankAccount, "generate_account_number", return_value="1234567890"
+        ) as generate:
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                BankAccount.objects.create(user_id=None)
+        self.assertEqual(generate.call_count, 1)
+
+
+class KYCDocumentValidatorTests(SimpleTestCase):
+    PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+    PDF = b"%PDF-1.7\n" + b"\x00" * 16
+
+    def validate(self, name, content):
+        KYCDocumentValidator()(SimpleUploadedFile(name, content))
+
+    def test_accepts_matching_extension_and_header(self):
+        self.validate("id.png", self.PNG)
+        self.validate("id.PDF", self.PDF)
+
+    def test_rejects_header_of_another_allowed_type(self):
+        with self.assertRaisesMessage(ValidationError, "Invalid file type"):
+            self.validate("id.jpg", self.PDF)
+
+    def test_rejects_unknown_header(self):
+        with self.assertRaisesMessage(ValidationError, "Invalid file type"):
+            self.validate("id.png", b"<html>" + b"\x00" * 16)
+
+    def test_rejects_disallowed_extension(self):
+        with self.assertRaisesMessage(ValidationError, "Only JPG, PNG, and PDF"):
+            self.validate("id.gif", self.PNG)
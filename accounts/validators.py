@@ -2,10 +2,25 @@
 Custom validators for SecureBank accounts.
 """
 
+import os
 import re
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
+_UPPERCASE_RE = re.compile(r"[A-Z]")
+_LOWERCASE_RE = re.compile(r"[a-z]")
+_DIGIT_RE = re.compile(r"\d")
+_SPECIAL_RE = re.compile(r'[!@#$%^&*()_+\-=\[\]{};:"\\|,.<>\/?]')
+_REPEATED_RE = re.compile(r"(.)\1{2,}")
+
+# Leading bytes each allowed KYC extension's files must start with
+_KYC_SIGNATURES = {
+    ".jpg": b"\xff\xd8\xff",
+    ".jpeg": b"\xff\xd8\xff",
+    ".png": b"\x89PNG\r\n\x1a\n",
+    ".pdf": b"%PDF-",
+}
+
 
 class PasswordComplexityValidator:
     """
@@ -20,23 +35,23 @@ class PasswordComplexityValidator:
             errors.append(_("Password must be at least 12 characters long."))
 
         # Check for uppercase letters
-        if not re.search(r"[A-Z]", password):
+        if not _UPPERCASE_RE.search(password):
             errors.append(_("Password must contain at least one uppercase letter."))
 
         # Check for lowercase letters
-        if not re.search(r"[a-z]", password):
+        if not _LOWERCASE_RE.search(password):
             errors.append(_("Password must contain at least one lowercase letter."))
 
         # Check for digits
-        if not re.search(r"\d", password):
+        if not _DIGIT_RE.search(password):
             errors.append(_("Password must contain at least one digit."))
 
         # Check for special characters
-        if not re.search(r'[!@#$%^&*()_+\-=\[\]{};:"\\|,.<>\/?]', password):
+        if not _SPECIAL_RE.search(password):
             errors.append(_("Password must contain at least one special character."))
 
         # Check for common patterns
-        if re.search(r"(.)\1{2,}", password):  # Three or more repeated characters
+        if _REPEATED_RE.search(password):  # Three or more repeated characters
             errors.append(
                 _("Password cannot contain three or more repeated characters in a row.")
             )
@@ -58,16 +73,12 @@ class PasswordComplexityValidator:
 
     def has_sequential_chars(self, password):
         """Check for sequential characters in password."""
-        password_lower = password.lower()
+        codes = list(map(ord, password.lower()))
 
-        # Check for numeric sequences
-        for i in range(len(password_lower) - 2):
-            if ord(password_lower[i]) + 1 == ord(password_lower[i + 1]) and ord(
-                password_lower[i + 1]
-            ) + 1 == ord(password_lower[i + 2]):
-                return True
-
-        return False
+        # Any window of three code points that each step up by one
+        return any(
+            b == a + 1 and c == b + 1 for a, b, c in zip(codes, codes[1:], codes[2:])
+        )
 
 
 class AccountNumberValidator:
@@ -103,7 +114,7 @@ class PhoneNumberValidator:
 
     def __call__(self, value):
         # Remove all non-digit characters
-        clean_number = re.sub(r"[^\d]", "", value)
+        clean_number = "".join(filter(str.isdecimal, value))
 
         if not clean_number:
             raise ValidationError(_("Phone number cannot be empty."))
@@ -165,13 +176,15 @@ class KYCDocumentValidator:
             raise ValidationError(_("File size cannot exceed 5MB."))
 
         # Check file extension
-        allowed_extensions = ["jpg", "jpeg", "png", "pdf"]
-        file_extension = value.name.split(".")[-1].lower()
+        file_extension = os.path.splitext(value.name)[1].lower()
 
-        if file_extension not in allowed_extensions:
+        if file_extension not in _KYC_SIGNATURES:
             raise ValidationError(_("Only JPG, PNG, and PDF files are allowed."))
 
-        # Check MIME type
-        allowed_mime_types = ["image/jpeg", "image/png", "application/pdf"]
-        if value.content_type not in allowed_mime_types:
+        # Check the file header rather than the client-supplied content
+        # type, and that it is the kind of file the extension claims
+        value.seek(0)
+        header = value.read(8)
+        value.seek(0)
+        if not header.startswith(_KYC_SIGNATURES[file_extension]):
             raise ValidationError(_("Invalid file type."))
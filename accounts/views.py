@@ -9,9 +9,13 @@ from django.contrib import messages
 from django.views.generic import TemplateView
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.contrib.auth.mixins import LoginRequiredMixin
 
+from . import audit
+from .models import User
+
 
 class LoginView(TemplateView):
     template_name = "login.html"
@@ -20,11 +24,34 @@ class LoginView(TemplateView):
         email = request.POST.get("email")
         password = request.POST.get("password")
 
-        user = authenticate(request, username=email, password=password)
+        # authenticate() runs the password hasher on every path and refuses
+        # locked accounts, so a locked account gets the same reply as a wrong
+        # password. Only the audit row records the lockout.
+        # One timestamp for both lockout checks in this request
+        now = timezone.now()
+        user = authenticate(request, username=email, password=password, now=now)
+        if user is not None:
+            failure_reason = ""
+        elif email and User.is_email_locked(email, now):
+            failure_reason = "Account locked"
+        else:
+            failure_reason = "Invalid credentials"
+        audit.record(
+            email=email or "",
+            ip_address=request.META.get("REMOTE_ADDR"),
+            user=user,
+            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            success=user is not None,
+            failure_reason=failure_reason,
+        )
         if user is not None:
+            user.clear_failed_logins()
             login(request, user)
             return JsonResponse({"success": True, "redirect": "/dashboard/"})
         else:
+            # Attempts during a lockout do not extend it
+            if email and failure_reason != "Account locked":
+                User.register_failed_login(email)
             return JsonResponse({"success": False, "message": "Invalid credentials"})
 
 
@@ -4,6 +4,8 @@ Admin configuration for crypto app.
 
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+
+from securebank.admin import ListOnlyFieldsMixin
 from .models import (
     Cryptocurrency,
     CryptoWallet,
@@ -23,7 +25,7 @@ class CryptocurrencyAdmin(admin.ModelAdmin):
 
 
 @admin.register(CryptoWallet)
-class CryptoWalletAdmin(admin.ModelAdmin):
+class CryptoWalletAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = (
         "user",
         "cryptocurrency",
@@ -32,13 +34,26 @@ class CryptoWalletAdmin(admin.ModelAdmin):
         "status",
         "is_default",
     )
+    list_select_related = ("user", "cryptocurrency")
     list_filter = ("wallet_type", "status", "is_default", "created_at")
     search_fields = ("user__email", "cryptocurrency__symbol", "wallet_address")
     readonly_fields = ("id", "created_at", "updated_at")
 
+    # Key material is left out; the change form still loads it.
+    list_only_fields = (
+        "id",
+        "user__email",
+        "cryptocurrency__symbol",
+        "cryptocurrency__name",
+        "wallet_address",
+        "balance",
+        "status",
+        "is_default",
+    )
+
 
 @admin.register(CryptoTransaction)
-class CryptoTransactionAdmin(admin.ModelAdmin):
+class CryptoTransactionAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = (
         "reference",
         "user",
@@ -48,16 +63,41 @@ class CryptoTransactionAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("user", "cryptocurrency")
     list_filter = ("transaction_type", "status", "cryptocurrency", "created_at")
     search_fields = ("reference", "user__email", "blockchain_tx_hash")
     readonly_fields = ("id", "reference", "created_at", "updated_at")
+    show_full_result_count = False
+    list_per_page = 50
+    list_only_fields = (
+        "id",
+        "reference",
+        "user__email",
+        "cryptocurrency__symbol",
+        "cryptocurrency__name",
+        "transaction_type",
+        "amount",
+        "status",
+        "created_at",
+    )
 
 
 @admin.register(CryptoPriceHistory)
-class CryptoPriceHistoryAdmin(admin.ModelAdmin):
+class CryptoPriceHistoryAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = ("cryptocurrency", "price", "market_cap", "timestamp")
+    list_select_related = ("cryptocurrency",)
     list_filter = ("cryptocurrency", "timestamp")
     readonly_fields = ("timestamp",)
+    show_full_result_count = False
+    list_per_page = 50
+    list_only_fields = (
+        "id",
+        "cryptocurrency__symbol",
+        "cryptocurrency__name",
+        "price",
+        "market_cap",
+        "timestamp",
+    )
 
     def has_add_permission(self, request):
         return False
@@ -72,6 +112,7 @@ class CryptoPortfolioAdmin(admin.ModelAdmin):
         "total_profit_loss_usd",
         "last_updated",
     )
+    list_select_related = ("user",)
     search_fields = ("user__email",)
     readonly_fields = ("last_updated",)
 
@@ -85,6 +126,7 @@ class CryptoWatchlistAdmin(admin.ModelAdmin):
         "alert_enabled",
         "created_at",
     )
+    list_select_related = ("user", "cryptocurrency")
     list_filter = ("alert_enabled", "created_at")
     search_fields = ("user__email", "cryptocurrency__symbol")
     readonly_fields = ("created_at",)
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crypto", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="cryptotransaction",
+            name="crypto_tran_referen_75194c_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="cryptotransaction",
+            name="crypto_tran_status_577742_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="cryptotransaction",
+            name="crypto_tran_user_id_76bbf7_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="cryptotransaction",
+            name="crypto_tran_cryptoc_558f27_idx",
+        ),
+        migrations.AddIndex(
+            model_name="cryptotransaction",
+            index=models.Index(
+                fields=["user", "-created_at"], name="crypto_tran_user_id_9b9663_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cryptotransaction",
+            index=models.Index(
+                fields=["status", "-created_at"], name="crypto_tran_status_e46fa1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cryptotransaction",
+            index=models.Index(
+                fields=["cryptocurrency", "-created_at"],
+                name="crypto_tran_cryptoc_03667c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cryptotransaction",
+            index=models.Index(
+                fields=["wallet", "-created_at"], name="crypto_tran_wallet__758c01_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:09
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Q
+
+
+def clear_extra_default_wallets(apps, schema_editor):
+    # Keep each user's most recently updated default wallet
+    CryptoWallet = apps.get_model("crypto", "CryptoWallet")
+    newer_default = CryptoWallet.objects.filter(
+        Q(updated_at__gt=OuterRef("updated_at"))
+        | Q(updated_at=OuterRef("updated_at"), pk__gt=OuterRef("pk")),
+        user_id=OuterRef("user_id"),
+        is_default=True,
+    )
+    CryptoWallet.objects.filter(is_default=True).filter(Exists(newer_default)).update(
+        is_default=False
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crypto", "0002_transaction_composite_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="cryptowallet",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="cryptowallet",
+            constraint=models.UniqueConstraint(
+                fields=("user", "cryptocurrency"), name="uniq_user_crypto"
+            ),
+        ),
+        migrations.RunPython(clear_extra_default_wallets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="cryptowallet",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_default", True)),
+                fields=("user",),
+                name="uniq_default_wallet",
+            ),
+        ),
+    ]
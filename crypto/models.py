@@ -4,17 +4,28 @@ Handles crypto wallets, transactions, and portfolio management.
 """
 
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
 
 from accounts.models import BankAccount
+from securebank.references import generate_reference
+from securebank.totals import StoredTotalMixin, StoredTotalQuerySet
 
 User = get_user_model()
 
 
+class UserCryptoQuerySet(models.QuerySet):
+    def with_related(self):
+        """Join the owning user and cryptocurrency that listings render."""
+        return self.select_related("user", "cryptocurrency")
+
+
 class Cryptocurrency(models.Model):
     """
     Supported cryptocurrencies with their properties.
@@ -147,11 +158,23 @@ class CryptoWallet(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = UserCryptoQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Crypto Wallet")
         verbose_name_plural = _("Crypto Wallets")
         db_table = "crypto_wallet"
-        unique_together = ["user", "cryptocurrency"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "cryptocurrency"], name="uniq_user_crypto"
+            ),
+            # At most one default wallet per user, enforced by a partial index.
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(is_default=True),
+                name="uniq_default_wallet",
+            ),
+        ]
         ordering = ["-created_at"]
 
     def __str__(self):
@@ -166,7 +189,11 @@ class CryptoWallet(models.Model):
         return self.is_active and amount <= self.available_balance
 
 
-class CryptoTransaction(models.Model):
+class CryptoTransactionQuerySet(UserCryptoQuerySet, StoredTotalQuerySet):
+    """UserCryptoQuerySet whose bulk_create() also fills total_value."""
+
+
+class CryptoTransaction(StoredTotalMixin, models.Model):
     """
     Cryptocurrency transactions.
     """
@@ -255,51 +282,40 @@ class CryptoTransaction(models.Model):
     completed_at = models.DateTimeField(_("completed at"), null=True, blank=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = CryptoTransactionQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Crypto Transaction")
         verbose_name_plural = _("Crypto Transactions")
         db_table = "crypto_transaction"
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["reference"]),
-            models.Index(fields=["status"]),
             models.Index(fields=["transaction_type"]),
-            models.Index(fields=["user"]),
-            models.Index(fields=["cryptocurrency"]),
+            models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["status", "-created_at"]),
+            models.Index(fields=["cryptocurrency", "-created_at"]),
+            models.Index(fields=["wallet", "-created_at"]),
         ]
 
+    TOTAL_FIELD = "total_value"
+    TOTAL_INPUTS = ("amount", "price_per_unit")
+
     def __str__(self):
         return f"{self.reference} - {self.transaction_type} {self.amount} {self.cryptocurrency.symbol}"
 
     def save(self, *args, **kwargs):
         if not self.reference:
             self.reference = self.generate_reference()
+        super().save(*args, **kwargs)
 
-        # Calculate total value
+    def calculate_total(self):
         if self.amount and self.price_per_unit:
-            self.total_value = self.amount * self.price_per_unit
-
-        super().save(*args, **kwargs)
+            return self.amount * self.price_per_unit
+        return self.total_value
 
     def generate_reference(self):
         """Generate unique transaction reference."""
-        import random
-        import string
-
-        while True:
-            prefix = "CRX"
-            timestamp = (
-                str(int(self.created_at.timestamp() * 1000))
-                if self.created_at
-                else str(int(uuid.uuid4().int)[:10])
-            )
-            random_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=8)
-            )
-            reference = f"{prefix}{timestamp}{random_str}"
-
-            if not CryptoTransaction.objects.filter(reference=reference).exists():
-                return reference
+        return generate_reference("CRX")
 
     @property
     def is_completed(self):
@@ -311,7 +327,7 @@ class CryptoTransaction(models.Model):
 
     def can_be_cancelled(self):
         """Check if transaction can be cancelled."""
-        return self.status in ["PENDING", "PROCESSING"]
+        return self.status in {"PENDING", "PROCESSING"}
 
 
 class CryptoPriceHistory(models.Model):
@@ -387,15 +403,13 @@ class CryptoPortfolio(models.Model):
 
     def update_portfolio(self):
         """Update portfolio values based on current crypto prices."""
-        from django.db.models import Sum
-
-        wallets = self.user.crypto_wallets.filter(status="ACTIVE")
-        total_value = Decimal("0.00")
-
-        for wallet in wallets:
-            current_price = wallet.cryptocurrency.current_price
-            wallet_value = wallet.balance * current_price
-            total_value += wallet_value
+        wallets = CryptoWallet.objects.filter(user_id=self.user_id, status="ACTIVE")
+        total_value = wallets.aggregate(
+            total=Sum(
+                F("balance") * F("cryptocurrency__current_price"),
+                output_field=DecimalField(max_digits=30, decimal_places=8),
+            )
+        )["total"] or Decimal("0.00")
 
         self.total_value_usd = total_value
         self.total_profit_loss_usd = total_value - self.total_invested_usd
@@ -405,7 +419,60 @@ class CryptoPortfolio(models.Model):
                 self.total_profit_loss_usd / self.total_invested_usd
             ) * 100
 
-        self.save()
+        self.save(
+            update_fields=[
+                "total_value_usd",
+                "total_profit_loss_usd",
+                "total_profit_loss_percentage",
+                "last_updated",
+            ]
+        )
+
+    @classmethod
+    def refresh_all(cls):
+        """
+        Recompute every portfolio from current prices without loading rows.
+
+        The wallet totals are aggregated by a correlated subquery, so the
+        whole refresh is two UPDATE statements regardless of user count.
+        """
+        wallet_totals = (
+            CryptoWallet.objects.filter(user_id=OuterRef("user_id"), status="ACTIVE")
+            .values("user_id")
+            .annotate(
+                total=Sum(
+                    F("balance") * F("cryptocurrency__current_price"),
+                    output_field=DecimalField(max_digits=30, decimal_places=8),
+                )
+            )
+            .values("total")
+        )
+        money = DecimalField(max_digits=15, decimal_places=2)
+
+        with transaction.atomic():
+            cls.objects.update(
+                total_value_usd=Coalesce(
+                    Subquery(wallet_totals, output_field=money),
+                    Value(Decimal("0.00")),
+                    output_field=money,
+                ),
+                last_updated=timezone.now(),
+            )
+            # Second pass so the derived columns read the new totals instead
+            # of repeating the subquery.
+            cls.objects.update(
+                total_profit_loss_usd=F("total_value_usd") - F("total_invested_usd"),
+                total_profit_loss_percentage=Case(
+                    When(
+                        total_invested_usd__gt=0,
+                        then=(F("total_value_usd") - F("total_invested_usd"))
+                        * 100
+                        / F("total_invested_usd"),
+                    ),
+                    default=F("total_profit_loss_percentage"),
+                    output_field=DecimalField(max_digits=10, decimal_places=2),
+                ),
+            )
 
 
 class CryptoWatchlist(models.Model):
@@ -1,3 +1,93 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Cryptocurrency, CryptoPortfolio, CryptoWallet
+
+User = get_user_model()
+
+
+class CryptoPortfolioRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        btc = Cryptocurrency.objects.create(
+            symbol="BTC", name="Bitcoin", crypto_type="BTC", current_price=100
+        )
+        eth = Cryptocurrency.objects.create(
+            symbol="ETH", name="Ethereum", crypto_type="ETH", current_price=10
+        )
+        cls.holder = User.objects.create_user(
+            username="holder", email="holder@example.com", password="pw"
+        )
+        cls.empty = User.objects.create_user(
+            username="empty", email="empty@example.com", password="pw"
+        )
+        CryptoWallet.objects.create(
+            user=cls.holder, cryptocurrency=btc, wallet_address="a", balance=2
+        )
+        CryptoWallet.objects.create(
+            user=cls.holder, cryptocurrency=eth, wallet_address="b", balance=5
+        )
+        usdt = Cryptocurrency.objects.create(
+            symbol="USDT", name="Tether", crypto_type="USDT", current_price=1
+        )
+        CryptoWallet.objects.create(
+            user=cls.holder,
+            cryptocurrency=usdt,
+            wallet_address="c",
+            balance=100,
+            status="FROZEN",
+        )
+        CryptoPortfolio.objects.create(
+            user=cls.holder, total_invested_usd=Decimal("200.00")
+        )
+        CryptoPortfolio.objects.create(user=cls.empty, total_value_usd=Decimal("50.00"))
+
+    def test_refresh_all_matches_update_portfolio(self):
+        CryptoPortfolio.refresh_all()
+        refreshed = {p.user_id: p for p in CryptoPortfolio.objects.all()}
+        for portfolio in CryptoPortfolio.objects.all():
+            portfolio.update_portfolio()
+            portfolio.refresh_from_db()
+            bulk = refreshed[portfolio.user_id]
+            self.assertEqual(bulk.total_value_usd, portfolio.total_value_usd)
+            self.assertEqual(
+                bulk.total_profit_loss_usd, portfolio.total_profit_loss_usd
+            )
+            self.assertEqual(
+                bulk.total_profit_loss_percentage,
+                portfolio.total_profit_loss_percentage,
+            )
+
+    def test_refresh_all_values(self):
+        CryptoPortfolio.refresh_all()
+        holder = CryptoPortfolio.objects.get(user=self.holder)
+        self.assertEqual(holder.total_value_usd, Decimal("250.00"))
+        self.assertEqual(holder.total_profit_loss_usd, Decimal("50.00"))
+        self.assertEqual(holder.total_profit_loss_percentage, Decimal("25.00"))
+        empty = CryptoPortfolio.objects.get(user=self.empty)
+        self.assertEqual(empty.total_value_usd, Decimal("0.00"))
+
+
+class UserCryptoQuerySetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="holder", email="holder@example.com", password="pw"
+        )
+        cls.eth = Cryptocurrency.objects.create(
+            symbol="ETH", name="Ethereum", crypto_type="ETH"
+        )
+        CryptoWallet.objects.create(
+            user=cls.user, cryptocurrency=cls.eth, wallet_address="addr-2"
+        )
+
+    def test_default_manager_does_not_join(self):
+        self.assertNotIn("JOIN", str(CryptoWallet.objects.all().query))
+
+    def test_with_related_joins_user_and_cryptocurrency(self):
+        with self.assertNumQueries(1):
+            wallet = CryptoWallet.objects.with_related().get()
+            self.assertEqual(wallet.user.email, "holder@example.com")
+            self.assertEqual(wallet.cryptocurrency.name, "Ethereum")
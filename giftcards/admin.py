@@ -4,6 +4,8 @@ Admin configuration for giftcards app.
 
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+
+from securebank.admin import ListOnlyFieldsMixin
 from .models import (
     GiftCardType,
     GiftCard,
@@ -25,20 +27,21 @@ class GiftCardTypeAdmin(admin.ModelAdmin):
 @admin.register(GiftCard)
 class GiftCardAdmin(admin.ModelAdmin):
     list_display = (
-        "gift_card_type",
+        "card_type_name",
         "face_value",
         "seller",
         "status",
         "offered_price",
         "created_at",
     )
+    list_select_related = ("seller",)
     list_filter = ("status", "condition", "country", "created_at")
     search_fields = ("seller__email", "gift_card_type__name", "card_code")
     readonly_fields = ("id", "created_at", "updated_at")
 
 
 @admin.register(GiftCardTransaction)
-class GiftCardTransactionAdmin(admin.ModelAdmin):
+class GiftCardTransactionAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = (
         "reference",
         "transaction_type",
@@ -47,9 +50,21 @@ class GiftCardTransactionAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("seller",)
     list_filter = ("transaction_type", "status", "created_at")
     search_fields = ("reference", "seller__email", "gift_card__gift_card_type__name")
     readonly_fields = ("id", "reference", "created_at", "updated_at")
+    show_full_result_count = False
+    list_per_page = 50
+    list_only_fields = (
+        "id",
+        "reference",
+        "transaction_type",
+        "seller__email",
+        "amount",
+        "status",
+        "created_at",
+    )
 
 
 @admin.register(GiftCardRate)
@@ -61,6 +76,7 @@ class GiftCardRateAdmin(admin.ModelAdmin):
         "valid_from",
         "is_active",
     )
+    list_select_related = ("gift_card_type",)
     list_filter = ("is_active", "valid_from")
     search_fields = ("gift_card_type__name",)
     readonly_fields = ("created_at",)
@@ -69,6 +85,7 @@ class GiftCardRateAdmin(admin.ModelAdmin):
 @admin.register(GiftCardDispute)
 class GiftCardDisputeAdmin(admin.ModelAdmin):
     list_display = ("transaction", "raised_by", "dispute_type", "status", "created_at")
+    list_select_related = ("transaction", "raised_by")
     list_filter = ("dispute_type", "status", "created_at")
     search_fields = ("transaction__reference", "raised_by__email", "description")
     readonly_fields = ("created_at", "updated_at")
@@ -83,6 +100,7 @@ class GiftCardInventoryAdmin(admin.ModelAdmin):
         "selling_price",
         "is_available",
     )
+    list_select_related = ("gift_card_type",)
     list_filter = ("is_available", "created_at")
     search_fields = ("gift_card_type__name",)
     readonly_fields = ("created_at", "updated_at")
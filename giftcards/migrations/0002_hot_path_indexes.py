@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("giftcards", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="giftcard",
+            index=models.Index(
+                fields=["status", "-created_at"], name="giftcards_g_status_07aeb4_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="giftcard",
+            index=models.Index(
+                fields=["seller", "status"], name="giftcards_g_seller__802d0d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="giftcard",
+            index=models.Index(
+                fields=["gift_card_type", "status"],
+                name="giftcards_g_gift_ca_49f293_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="giftcarddispute",
+            index=models.Index(
+                fields=["status", "-created_at"], name="giftcards_d_status_a6e5e4_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="giftcardinventory",
+            index=models.Index(
+                fields=["is_available", "gift_card_type"],
+                name="giftcards_i_is_avai_ca7cf3_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="giftcardtransaction",
+            index=models.Index(
+                fields=["status", "-created_at"], name="giftcards_t_status_193815_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="giftcardtransaction",
+            index=models.Index(
+                fields=["buyer", "-created_at"], name="giftcards_t_buyer_i_8d2164_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="giftcardtransaction",
+            index=models.Index(
+                fields=["seller", "-created_at"], name="giftcards_t_seller__f358ae_idx"
+            ),
+        ),
+    ]
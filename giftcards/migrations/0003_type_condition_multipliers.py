@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("giftcards", "0002_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="giftcardtype",
+            name="condition_multipliers",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text='e.g. {"GOOD": "0.92"}; missing conditions use the defaults',
+                verbose_name="condition multipliers",
+            ),
+        ),
+    ]
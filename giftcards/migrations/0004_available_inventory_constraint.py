@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:17
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Q
+
+
+def retire_duplicate_available_inventory(apps, schema_editor):
+    # Keep the most recently updated available row per type and face value
+    GiftCardInventory = apps.get_model("giftcards", "GiftCardInventory")
+    newer_available = GiftCardInventory.objects.filter(
+        Q(updated_at__gt=OuterRef("updated_at"))
+        | Q(updated_at=OuterRef("updated_at"), pk__gt=OuterRef("pk")),
+        gift_card_type_id=OuterRef("gift_card_type_id"),
+        face_value=OuterRef("face_value"),
+        is_available=True,
+    )
+    GiftCardInventory.objects.filter(is_available=True).filter(
+        Exists(newer_available)
+    ).update(is_available=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("giftcards", "0003_type_condition_multipliers"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="giftcardinventory",
+            unique_together=set(),
+        ),
+        migrations.RunPython(
+            retire_duplicate_available_inventory, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="giftcardinventory",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_available", True)),
+                fields=("gift_card_type", "face_value"),
+                name="uniq_available_inventory",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:17
+
+import giftcards.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("giftcards", "0004_available_inventory_constraint"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="giftcardtransaction",
+            name="reference",
+            field=models.CharField(
+                default=giftcards.models.transaction_reference,
+                max_length=50,
+                unique=True,
+                verbose_name="transaction reference",
+            ),
+        ),
+    ]
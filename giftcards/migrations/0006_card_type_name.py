@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:48
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_card_type_name(apps, schema_editor):
+    GiftCard = apps.get_model("giftcards", "GiftCard")
+    GiftCardType = apps.get_model("giftcards", "GiftCardType")
+    GiftCard.objects.update(
+        card_type_name=Subquery(
+            GiftCardType.objects.filter(pk=OuterRef("gift_card_type_id")).values(
+                "name"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("giftcards", "0005_transaction_reference_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="giftcard",
+            name="card_type_name",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=100,
+                verbose_name="card type name",
+            ),
+        ),
+        migrations.RunPython(backfill_card_type_name, migrations.RunPython.noop),
+    ]
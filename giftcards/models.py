@@ -3,16 +3,30 @@ Gift card models for SecureBank.
 Handles gift card trading, validation, and management.
 """
 
+import math
 import uuid
 from django.db import models
+from django.db.models import Case, ExpressionWrapper, F, Min, Q, Value, When
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+
+from securebank.references import generate_reference
+from securebank.totals import StoredTotalMixin, StoredTotalQuerySet
 
 User = get_user_model()
 
 
+class CardTypeQuerySet(models.QuerySet):
+    def with_type(self):
+        """Join the gift card type that pricing and __str__ read."""
+        return self.select_related("gift_card_type")
+
+
 class GiftCardType(models.Model):
     """
     Supported gift card types and categories.
@@ -56,6 +70,14 @@ class GiftCardType(models.Model):
         default="US,CA,UK",
     )
 
+    # Per-condition overrides of GiftCard.CONDITION_ADJUSTMENTS
+    condition_multipliers = models.JSONField(
+        _("condition multipliers"),
+        default=dict,
+        blank=True,
+        help_text='e.g. {"GOOD": "0.92"}; missing conditions use the defaults',
+    )
+
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
@@ -67,6 +89,75 @@ class GiftCardType(models.Model):
     def __str__(self):
         return f"{self.name} ({self.category})"
 
+    def clean(self):
+        super().clean()
+        if not isinstance(self.condition_multipliers, dict):
+            raise ValidationError(
+                {
+                    "condition_multipliers": _(
+                        "Enter an object mapping card conditions to multipliers."
+                    )
+                }
+            )
+        errors = []
+        for condition, override in self.condition_multipliers.items():
+            if condition not in GiftCard.CONDITION_ADJUSTMENTS:
+                errors.append(
+                    _("Unknown card condition: {condition}.").format(
+                        condition=condition
+                    )
+                )
+                continue
+            try:
+                multiplier = Decimal(str(override))
+            except InvalidOperation:
+                multiplier = None
+            if multiplier is None or not (
+                multiplier.is_finite() and 0 < multiplier <= 1
+            ):
+                errors.append(
+                    _(
+                        "Multiplier for {condition} must be a number above 0 and at most 1."
+                    ).format(condition=condition)
+                )
+        if errors:
+            raise ValidationError({"condition_multipliers": errors})
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep the cards' denormalized copy of the name in step
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "name" in update_fields:
+            self.cards.exclude(card_type_name=self.name).update(
+                card_type_name=self.name
+            )
+
+    @classmethod
+    def for_country(cls, code):
+        """
+        Types whose supported_countries list contains code exactly, so "US"
+        does not match "AUS".
+        """
+        return cls.objects.filter(
+            Q(supported_countries=code)
+            | Q(supported_countries__startswith=f"{code},")
+            | Q(supported_countries__endswith=f",{code}")
+            | Q(supported_countries__contains=f",{code},")
+        )
+
+    def supports_country(self, code):
+        return code in self.supported_countries.split(",")
+
+    def get_condition_multiplier(self, condition):
+        """Return the buy-rate multiplier for a card condition as a Decimal."""
+        if condition not in GiftCard.CONDITION_ADJUSTMENTS:
+            # Unknown conditions price as POOR, as reprice_pending() does
+            condition = "POOR"
+        override = self.condition_multipliers.get(condition)
+        if override is not None:
+            return Decimal(str(override))
+        return GiftCard.CONDITION_ADJUSTMENTS[condition]
+
 
 class GiftCard(models.Model):
     """
@@ -90,6 +181,16 @@ class GiftCard(models.Model):
         ("POOR", _("Poor")),
     ]
 
+    # Multipliers applied to the type's buy rate, kept as Decimal so the
+    # price maths never mixes in floats.
+    CONDITION_ADJUSTMENTS = {
+        "NEW": Decimal("1.00"),
+        "LIKE_NEW": Decimal("0.95"),
+        "GOOD": Decimal("0.90"),
+        "FAIR": Decimal("0.80"),
+        "POOR": Decimal("0.70"),
+    }
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     seller = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="sold_giftcards"
@@ -97,6 +198,10 @@ class GiftCard(models.Model):
     gift_card_type = models.ForeignKey(
         GiftCardType, on_delete=models.CASCADE, related_name="cards"
     )
+    # Copy of gift_card_type.name, so __str__ and listings skip the join
+    card_type_name = models.CharField(
+        _("card type name"), max_length=100, blank=True, editable=False
+    )
 
     # Card details
     card_code = models.CharField(_("card code"), max_length=100)
@@ -145,14 +250,31 @@ class GiftCard(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = CardTypeQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Gift Card")
         verbose_name_plural = _("Gift Cards")
         db_table = "giftcards_giftcard"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "-created_at"]),
+            models.Index(fields=["seller", "status"]),
+            models.Index(fields=["gift_card_type", "status"]),
+        ]
 
     def __str__(self):
-        return f"{self.gift_card_type.name} - ${self.face_value} - {self.status}"
+        return f"{self.card_type_name} - ${self.face_value} - {self.status}"
+
+    def save(self, *args, **kwargs):
+        if self.gift_card_type_id and (
+            not self.card_type_name or GiftCard.gift_card_type.is_cached(self)
+        ):
+            self.card_type_name = self.gift_card_type.name
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "gift_card_type" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "card_type_name"}
+        super().save(*args, **kwargs)
 
     @property
     def is_verified(self):
@@ -164,23 +286,51 @@ class GiftCard(models.Model):
 
     def calculate_offered_price(self):
         """Calculate offered price based on card type rates and condition."""
-        base_rate = self.gift_card_type.buy_rate
-
-        # Adjust rate based on condition
-        condition_adjustments = {
-            "NEW": 1.0,
-            "LIKE_NEW": 0.95,
-            "GOOD": 0.90,
-            "FAIR": 0.80,
-            "POOR": 0.70,
-        }
-
-        adjusted_rate = base_rate * condition_adjustments.get(self.condition, 0.70)
+        card_type = self.gift_card_type
+        adjusted_rate = card_type.buy_rate * card_type.get_condition_multiplier(
+            self.condition
+        )
         self.offered_price = (self.face_value * adjusted_rate) / 100
         return self.offered_price
 
+    @classmethod
+    def reprice_pending(cls):
+        """
+        Recompute offered_price for every pending card in the database,
+        with one UPDATE per gift card type.
+        """
+        price = models.DecimalField(max_digits=10, decimal_places=2)
+        card_types = GiftCardType.objects.filter(cards__status="PENDING").distinct()
+        for card_type in card_types:
+            multiplier = Case(
+                *[
+                    When(
+                        Q(condition=condition),
+                        then=Value(card_type.get_condition_multiplier(condition)),
+                    )
+                    for condition, _label in cls.CONDITION_CHOICES
+                ],
+                default=Value(card_type.get_condition_multiplier("POOR")),
+                output_field=price,
+            )
+            cls.objects.filter(gift_card_type=card_type, status="PENDING").update(
+                offered_price=ExpressionWrapper(
+                    F("face_value") * Value(card_type.buy_rate) * multiplier / 100,
+                    output_field=price,
+                )
+            )
+
+
+def transaction_reference():
+    """
+    Default GiftCardTransaction reference, so bulk_create fills it in too.
 
-class GiftCardTransaction(models.Model):
+    No uniqueness check is needed; see securebank.references.
+    """
+    return generate_reference("GFT")
+
+
+class GiftCardTransaction(StoredTotalMixin, models.Model):
     """
     Gift card buy/sell transactions.
     """
@@ -200,7 +350,12 @@ class GiftCardTransaction(models.Model):
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    reference = models.CharField(_("transaction reference"), max_length=50, unique=True)
+    reference = models.CharField(
+        _("transaction reference"),
+        max_length=50,
+        unique=True,
+        default=transaction_reference,
+    )
     transaction_type = models.CharField(
         _("transaction type"), max_length=10, choices=TRANSACTION_TYPE_CHOICES
     )
@@ -257,44 +412,24 @@ class GiftCardTransaction(models.Model):
     completed_at = models.DateTimeField(_("completed at"), null=True, blank=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = StoredTotalQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Gift Card Transaction")
         verbose_name_plural = _("Gift Card Transactions")
         db_table = "giftcards_transaction"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "-created_at"]),
+            models.Index(fields=["buyer", "-created_at"]),
+            models.Index(fields=["seller", "-created_at"]),
+        ]
+
+    TOTAL_INPUTS = ("amount", "fee")
 
     def __str__(self):
         return f"{self.reference} - {self.transaction_type} - ${self.amount}"
 
-    def save(self, *args, **kwargs):
-        if not self.reference:
-            self.reference = self.generate_reference()
-
-        # Calculate total amount
-        self.total_amount = self.amount + self.fee
-
-        super().save(*args, **kwargs)
-
-    def generate_reference(self):
-        """Generate unique transaction reference."""
-        import random
-        import string
-
-        while True:
-            prefix = "GFT"
-            timestamp = (
-                str(int(self.created_at.timestamp() * 1000))
-                if self.created_at
-                else str(int(uuid.uuid4().int)[:10])
-            )
-            random_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=8)
-            )
-            reference = f"{prefix}{timestamp}{random_str}"
-
-            if not GiftCardTransaction.objects.filter(reference=reference).exists():
-                return reference
-
 
 class GiftCardRate(models.Model):
     """
@@ -320,15 +455,66 @@ class GiftCardRate(models.Model):
 
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
 
+    objects = CardTypeQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Gift Card Rate")
         verbose_name_plural = _("Gift Card Rates")
         db_table = "giftcards_rate"
         ordering = ["-valid_from"]
 
+    RATE_CACHE_TIMEOUT = 60
+    _UNCACHED = object()
+
     def __str__(self):
         return f"{self.gift_card_type.name} - Buy: {self.buy_rate}%, Sell: {self.sell_rate}%"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete(self.rate_cache_key(self.gift_card_type_id))
+
+    def delete(self, *args, **kwargs):
+        cache.delete(self.rate_cache_key(self.gift_card_type_id))
+        return super().delete(*args, **kwargs)
+
+    @staticmethod
+    def rate_cache_key(gift_card_type_id):
+        return f"giftcards:rate:{gift_card_type_id}"
+
+    @classmethod
+    def get_current(cls, gift_card_type_id):
+        """
+        Return the current rate values for a card type, or None, cached
+        between rate updates and until the next rate starts or expires.
+        """
+        key = cls.rate_cache_key(gift_card_type_id)
+        cached = cache.get(key, cls._UNCACHED)
+        if cached is not cls._UNCACHED:
+            return cached
+
+        now = timezone.now()
+        live = cls.objects.filter(
+            gift_card_type_id=gift_card_type_id, is_active=True
+        ).filter(Q(valid_until__isnull=True) | Q(valid_until__gt=now))
+        current = (
+            live.filter(valid_from__lte=now)
+            .order_by("-valid_from")
+            .values("buy_rate", "sell_rate", "min_amount", "max_amount", "valid_until")
+            .first()
+        )
+        boundaries = [
+            live.filter(valid_from__gt=now).aggregate(Min("valid_from"))[
+                "valid_from__min"
+            ]
+        ]
+        if current is not None:
+            boundaries.append(current.pop("valid_until"))
+        timeout = cls.RATE_CACHE_TIMEOUT
+        for boundary in filter(None, boundaries):
+            timeout = min(timeout, math.ceil((boundary - now).total_seconds()))
+        cache.set(key, current, timeout=timeout)
+        return current
+
 
 class GiftCardDispute(models.Model):
     """
@@ -384,6 +570,7 @@ class GiftCardDispute(models.Model):
         verbose_name = _("Gift Card Dispute")
         verbose_name_plural = _("Gift Card Disputes")
         db_table = "giftcards_dispute"
+        indexes = [models.Index(fields=["status", "-created_at"])]
 
     def __str__(self):
         return f"Dispute for {self.transaction.reference} - {self.status}"
@@ -407,11 +594,21 @@ class GiftCardInventory(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = CardTypeQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Gift Card Inventory")
         verbose_name_plural = _("Gift Card Inventory")
         db_table = "giftcards_inventory"
-        unique_together = ["gift_card_type", "face_value"]
+        constraints = [
+            # Only stock on sale must be unique; retired rows may repeat.
+            models.UniqueConstraint(
+                fields=["gift_card_type", "face_value"],
+                condition=Q(is_available=True),
+                name="uniq_available_inventory",
+            ),
+        ]
+        indexes = [models.Index(fields=["is_available", "gift_card_type"])]
 
     def __str__(self):
         return (
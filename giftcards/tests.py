@@ -1,3 +1,220 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.utils import timezone
+
+from .models import GiftCard, GiftCardRate, GiftCardType
+
+User = get_user_model()
+
+
+class GiftCardTestData:
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = User.objects.create_user(
+            username="seller", email="seller@example.com", password="pw"
+        )
+        cls.card_type = GiftCardType.objects.create(name="Amazon", category="RETAIL")
+        cls.card = GiftCard.objects.create(
+            seller=cls.seller,
+            gift_card_type=cls.card_type,
+            card_code="CODE-1",
+            face_value=Decimal("100.00"),
+            offered_price=Decimal("85.00"),
+        )
+
+
+class GiftCardTypeCountryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.us_only = GiftCardType.objects.create(
+            name="US only", category="RETAIL", supported_countries="US"
+        )
+        cls.north_america = GiftCardType.objects.create(
+            name="North America", category="RETAIL", supported_countries="CA,US,MX"
+        )
+        cls.australia = GiftCardType.objects.create(
+            name="Australia", category="RETAIL", supported_countries="NZ,AUS"
+        )
+
+    def test_for_country_matches_whole_codes(self):
+        self.assertCountEqual(
+            GiftCardType.for_country("US"), [self.us_only, self.north_america]
+        )
+        self.assertCountEqual(GiftCardType.for_country("AUS"), [self.australia])
+        self.assertCountEqual(GiftCardType.for_country("CA"), [self.north_america])
+
+    def test_supports_country_agrees_with_for_country(self):
+        for code in ["US", "CA", "MX", "NZ", "AUS", "AU"]:
+            with self.subTest(code=code):
+                self.assertCountEqual(
+                    GiftCardType.for_country(code),
+                    [
+                        card_type
+                        for card_type in GiftCardType.objects.all()
+                        if card_type.supports_country(code)
+                    ],
+                )
+
+
+class GiftCardRepriceTests(GiftCardTestData, TestCase):
+    def test_reprice_pending_matches_calculate_offered_price(self):
+        self.card_type.condition_multipliers = {"GOOD": "0.5"}
+        self.card_type.save()
+        for condition in ["NEW", "GOOD", "FAIR"]:
+            GiftCard.objects.create(
+                seller=self.seller,
+                gift_card_type=self.card_type,
+                card_code=condition,
+                face_value=Decimal("40.00"),
+                offered_price=Decimal("0.00"),
+                condition=condition,
+            )
+        GiftCard.reprice_pending()
+        for card in GiftCard.objects.all():
+            with self.subTest(condition=card.condition):
+                stored = card.offered_price
+                self.assertEqual(stored, card.calculate_offered_price())
+                self.assertNotEqual(stored, Decimal("0.00"))
+
+    def test_reprice_pending_leaves_other_statuses(self):
+        self.card_type.condition_multipliers = {"NEW": "0.5"}
+        self.card_type.save()
+        GiftCard.objects.filter(pk=self.card.pk).update(status="SOLD")
+        GiftCard.reprice_pending()
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.offered_price, Decimal("85.00"))
+
+
+class GiftCardTypeNameTests(GiftCardTestData, TestCase):
+    def test_save_copies_the_type_name(self):
+        self.assertEqual(self.card.card_type_name, "Amazon")
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.card_type_name, "Amazon")
+
+    def test_str_does_not_load_the_type(self):
+        card = GiftCard.objects.get(pk=self.card.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(card), "Amazon - $100.00 - PENDING")
+
+    def test_changing_type_updates_the_name(self):
+        other = GiftCardType.objects.create(name="Steam", category="GAMING")
+        card = GiftCard.objects.get(pk=self.card.pk)
+        card.gift_card_type = other
+        card.save(update_fields=["gift_card_type"])
+        card.refresh_from_db()
+        self.assertEqual(card.card_type_name, "Steam")
+
+    def test_renaming_type_updates_its_cards(self):
+        self.card_type.name = "Amazon US"
+        self.card_type.save()
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.card_type_name, "Amazon US")
+
+    def test_default_manager_does_not_join_type(self):
+        self.assertNotIn("JOIN", str(GiftCard.objects.all().query))
+        # .only() without the FK used to clash with the default join
+        self.assertEqual(GiftCard.objects.only("face_value").get().face_value, 100)
+
+    def test_with_type_joins_type(self):
+        with self.assertNumQueries(1):
+            card = GiftCard.objects.with_type().get()
+            self.assertEqual(card.gift_card_type.buy_rate, Decimal("85.00"))
+
+
+class ConditionMultiplierTests(GiftCardTestData, TestCase):
+    def assert_rejected(self, multipliers):
+        self.card_type.condition_multipliers = multipliers
+        with self.assertRaises(ValidationError) as ctx:
+            self.card_type.full_clean()
+        self.assertIn("condition_multipliers", ctx.exception.message_dict)
+
+    def test_valid_overrides_pass(self):
+        self.card_type.condition_multipliers = {"GOOD": "0.92", "FAIR": 0.8}
+        self.card_type.full_clean()
+
+    def test_rejects_non_numeric_values(self):
+        self.assert_rejected({"GOOD": "cheap"})
+        self.assert_rejected({"GOOD": "NaN"})
+
+    def test_rejects_out_of_range_values(self):
+        self.assert_rejected({"GOOD": "0"})
+        self.assert_rejected({"GOOD": "1.5"})
+        self.assert_rejected({"GOOD": "-0.5"})
+
+    def test_rejects_unknown_conditions_and_non_objects(self):
+        self.assert_rejected({"MINT": "0.9"})
+        self.assert_rejected(["0.9"])
+
+    def test_unknown_condition_uses_the_poor_override(self):
+        self.card_type.condition_multipliers = {"POOR": "0.5"}
+        self.assertEqual(
+            self.card_type.get_condition_multiplier("MINT"), Decimal("0.5")
+        )
+
+    def test_offered_price_matches_reprice_pending(self):
+        self.card_type.condition_multipliers = {"POOR": "0.5"}
+        self.card_type.save()
+        GiftCard.objects.filter(pk=self.card.pk).update(condition="MINT")
+        GiftCard.reprice_pending()
+        card = GiftCard.objects.with_type().get(pk=self.card.pk)
+        self.assertEqual(card.offered_price, card.calculate_offered_price())
+
+
+class GiftCardRateCurrentTests(GiftCardTestData, TestCase):
+    def setUp(self):
+        cache.delete(GiftCardRate.rate_cache_key(self.card_type.pk))
+
+    def make_rate(self, buy_rate, **kwargs):
+        return GiftCardRate.objects.create(
+            gift_card_type=self.card_type,
+            buy_rate=buy_rate,
+            sell_rate=Decimal("95.00"),
+            min_amount=Decimal("10.00"),
+            max_amount=Decimal("500.00"),
+            **kwargs,
+        )
+
+    def test_returns_the_latest_started_rate(self):
+        self.make_rate(Decimal("80.00"))
+        current = GiftCardRate.get_current(self.card_type.pk)
+        self.assertEqual(current["buy_rate"], Decimal("80.00"))
+        self.assertNotIn("valid_until", current)
+
+    def test_ignores_rates_that_have_not_started(self):
+        self.make_rate(Decimal("80.00"))
+        rate = self.make_rate(Decimal("90.00"))
+        # valid_from is auto_now_add, so schedule the rate after the insert
+        GiftCardRate.objects.filter(pk=rate.pk).update(
+            valid_from=timezone.now() + timedelta(hours=1)
+        )
+        current = GiftCardRate.get_current(self.card_type.pk)
+        self.assertEqual(current["buy_rate"], Decimal("80.00"))
+
+    def test_cache_expires_when_the_next_rate_starts(self):
+        self.make_rate(Decimal("80.00"))
+        rate = self.make_rate(Decimal("90.00"))
+        GiftCardRate.objects.filter(pk=rate.pk).update(
+            valid_from=timezone.now() + timedelta(seconds=10)
+        )
+        with mock.patch.object(cache, "set") as cache_set:
+            GiftCardRate.get_current(self.card_type.pk)
+        self.assertLessEqual(cache_set.call_args.kwargs["timeout"], 10)
+
+    def test_cache_expires_with_the_current_rate(self):
+        self.make_rate(
+            Decimal("80.00"), valid_until=timezone.now() + timedelta(seconds=5)
+        )
+        with mock.patch.object(cache, "set") as cache_set:
+            GiftCardRate.get_current(self.card_type.pk)
+        self.assertLessEqual(cache_set.call_args.kwargs["timeout"], 5)
 
-# Create your tests here.
+    def test_no_rate_is_cached_too(self):
+        self.assertIsNone(GiftCardRate.get_current(self.card_type.pk))
+        with self.assertNumQueries(0):
+            self.assertIsNone(GiftCardRate.get_current(self.card_type.pk))
@@ -4,6 +4,8 @@ Admin configuration for payments app.
 
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+
+from securebank.admin import ListOnlyFieldsMixin
 from .models import (
     PaymentMethod,
     PaymentTransaction,
@@ -15,22 +17,38 @@ from .models import (
 
 
 @admin.register(PaymentMethod)
-class PaymentMethodAdmin(admin.ModelAdmin):
+class PaymentMethodAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = (
         "user",
         "method_type",
-        "get_display_name",
+        "display_name",
         "is_default",
         "status",
         "created_at",
     )
+    list_select_related = ("user",)
     list_filter = ("method_type", "status", "is_default", "created_at")
     search_fields = ("user__email", "nickname", "bank_name", "card_last4")
     readonly_fields = ("id", "created_at", "updated_at")
+    list_only_fields = (
+        "id",
+        "user__email",
+        "method_type",
+        "nickname",
+        "display_name",
+        # __str__ renders get_display_name() from these
+        "card_brand",
+        "card_last4",
+        "bank_name",
+        "account_number",
+        "is_default",
+        "status",
+        "created_at",
+    )
 
 
 @admin.register(PaymentTransaction)
-class PaymentTransactionAdmin(admin.ModelAdmin):
+class PaymentTransactionAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = (
         "reference",
         "transaction_type",
@@ -40,31 +58,57 @@ class PaymentTransactionAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("user",)
     list_filter = ("transaction_type", "status", "currency", "created_at")
     search_fields = ("reference", "user__email", "paystack_reference", "description")
     readonly_fields = ("id", "reference", "created_at", "updated_at")
+    list_only_fields = (
+        "id",
+        "reference",
+        "transaction_type",
+        "user__email",
+        "amount",
+        "currency",
+        "status",
+        "created_at",
+    )
 
 
 @admin.register(PaystackCustomer)
-class PaystackCustomerAdmin(admin.ModelAdmin):
+class PaystackCustomerAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = ("user", "customer_code", "customer_email", "created_at")
+    list_select_related = ("user",)
     search_fields = ("user__email", "customer_code", "customer_email")
     readonly_fields = ("created_at", "updated_at")
+    list_only_fields = (
+        "id",
+        "user__email",
+        "customer_code",
+        "customer_email",
+        "created_at",
+    )
 
 
 @admin.register(PaystackWebhook)
-class PaystackWebhookAdmin(admin.ModelAdmin):
+class PaystackWebhookAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = ("event_type", "reference", "processed", "created_at")
     list_filter = ("event_type", "processed", "created_at")
     search_fields = ("reference", "event_type")
     readonly_fields = ("id", "created_at", "processed_at")
+    list_only_fields = (
+        "id",
+        "event_type",
+        "reference",
+        "processed",
+        "created_at",
+    )
 
     def has_add_permission(self, request):
         return False
 
 
 @admin.register(Refund)
-class RefundAdmin(admin.ModelAdmin):
+class RefundAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = (
         "reference",
         "original_transaction",
@@ -73,14 +117,28 @@ class RefundAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("user", "original_transaction")
     list_filter = ("status", "created_at")
     search_fields = ("reference", "user__email", "original_transaction__reference")
     readonly_fields = ("id", "reference", "created_at", "updated_at")
+    list_only_fields = (
+        "id",
+        "reference",
+        "original_transaction__reference",
+        "original_transaction__transaction_type",
+        "original_transaction__amount",
+        "original_transaction__currency",
+        "user__email",
+        "amount",
+        "status",
+        "created_at",
+    )
 
 
 @admin.register(PaymentNotification)
-class PaymentNotificationAdmin(admin.ModelAdmin):
+class PaymentNotificationAdmin(ListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = ("user", "notification_type", "title", "is_read", "created_at")
+    list_select_related = ("user",)
     list_filter = (
         "notification_type",
         "is_read",
@@ -90,3 +148,11 @@ class PaymentNotificationAdmin(admin.ModelAdmin):
     )
     search_fields = ("user__email", "title", "message")
     readonly_fields = ("created_at", "read_at")
+    list_only_fields = (
+        "id",
+        "user__email",
+        "notification_type",
+        "title",
+        "is_read",
+        "created_at",
+    )
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:18
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="paymentmethod",
+            name="display_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        models.Q(
+                            ("method_type", "CARD"),
+                            models.Q(("card_last4", ""), _negated=True),
+                        ),
+                        then=django.db.models.functions.text.Concat(
+                            "card_brand", models.Value(" ****"), "card_last4"
+                        ),
+                    ),
+                    models.When(
+                        models.Q(
+                            ("method_type", "BANK_TRANSFER"),
+                            models.Q(("account_number", ""), _negated=True),
+                        ),
+                        then=django.db.models.functions.text.Concat(
+                            "bank_name",
+                            models.Value(" ****"),
+                            django.db.models.functions.text.Right("account_number", 4),
+                        ),
+                    ),
+                    default=models.F("method_type"),
+                ),
+                output_field=models.CharField(
+                    max_length=120, verbose_name="display name"
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_uuid7_primary_keys"),
+        ("payments", "0002_method_display_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="paymenttransaction",
+            name="payments_pa_referen_929528_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="paymenttransaction",
+            name="payments_pa_user_id_e9fd9a_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="paystackwebhook",
+            name="payments_pa_process_c93bfe_idx",
+        ),
+        migrations.AddIndex(
+            model_name="paymenttransaction",
+            index=models.Index(
+                fields=["user", "-created_at"], name="payments_pa_user_id_05a7a5_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paymenttransaction",
+            index=models.Index(
+                fields=["user", "status"], name="payments_pa_user_id_026087_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paymenttransaction",
+            index=models.Index(
+                fields=["transaction_type", "status"],
+                name="payments_pa_transac_a1a387_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paystackwebhook",
+            index=models.Index(
+                fields=["processed", "created_at"],
+                name="payments_pa_process_42fa05_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0003_transaction_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="paystackwebhook",
+            name="payments_pa_process_42fa05_idx",
+        ),
+        migrations.AddIndex(
+            model_name="paystackwebhook",
+            index=models.Index(
+                condition=models.Q(("processed", False)),
+                fields=["created_at"],
+                name="webhook_unprocessed_idx",
+            ),
+        ),
+    ]
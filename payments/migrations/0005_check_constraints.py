@@ -0,0 +1,58 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_uuid7_primary_keys"),
+        ("payments", "0004_webhook_unprocessed_partial_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="paymentmethod",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("status__in", ["ACTIVE", "INACTIVE", "EXPIRED", "BLOCKED"])
+                ),
+                name="payment_method_status_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="paymenttransaction",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("amount__gt", 0)),
+                name="payment_transaction_amount_positive",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="paymenttransaction",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    (
+                        "status__in",
+                        [
+                            "INITIATED",
+                            "PENDING",
+                            "PROCESSING",
+                            "SUCCESS",
+                            "FAILED",
+                            "CANCELLED",
+                            "REFUNDED",
+                        ],
+                    )
+                ),
+                name="payment_transaction_status_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="refund",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("amount__gt", 0)), name="refund_amount_positive"
+            ),
+        ),
+    ]
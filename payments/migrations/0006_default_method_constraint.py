@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:23
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Q
+
+
+def clear_extra_default_methods(apps, schema_editor):
+    # Keep each user's most recently updated default payment method
+    PaymentMethod = apps.get_model("payments", "PaymentMethod")
+    newer_default = PaymentMethod.objects.filter(
+        Q(updated_at__gt=OuterRef("updated_at"))
+        | Q(updated_at=OuterRef("updated_at"), pk__gt=OuterRef("pk")),
+        user_id=OuterRef("user_id"),
+        is_default=True,
+    )
+    PaymentMethod.objects.filter(is_default=True).filter(Exists(newer_default)).update(
+        is_default=False
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0005_check_constraints"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_extra_default_methods, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="paymentmethod",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_default", True)),
+                fields=("user",),
+                name="uniq_default_payment_method",
+            ),
+        ),
+    ]
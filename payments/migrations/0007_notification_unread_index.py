@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0006_default_method_constraint"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="paymentnotification",
+            index=models.Index(
+                fields=["user", "is_read"], name="payments_no_user_id_1ba575_idx"
+            ),
+        ),
+    ]
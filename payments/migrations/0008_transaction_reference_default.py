@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:24
+
+import payments.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0007_notification_unread_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="paymenttransaction",
+            name="reference",
+            field=models.CharField(
+                default=payments.models.transaction_reference,
+                max_length=50,
+                unique=True,
+                verbose_name="transaction reference",
+            ),
+        ),
+    ]
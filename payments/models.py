@@ -4,17 +4,37 @@ Handles Paystack integration and payment processing.
 """
 
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Concat, Right
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
 
 from accounts.models import BankAccount
+from securebank.references import generate_reference
+from securebank.totals import StoredTotalMixin, StoredTotalQuerySet
 
 User = get_user_model()
 
 
+class UserOwnedQuerySet(models.QuerySet):
+    def with_related(self):
+        """Join the owning user, whose email __str__ renders."""
+        return self.select_related("user")
+
+
+# Module level so Meta's CHECK constraint can be built from them
+PAYMENT_METHOD_STATUS_CHOICES = [
+    ("ACTIVE", _("Active")),
+    ("INACTIVE", _("Inactive")),
+    ("EXPIRED", _("Expired")),
+    ("BLOCKED", _("Blocked")),
+]
+
+
 class PaymentMethod(models.Model):
     """
     User's saved payment methods.
@@ -28,12 +48,7 @@ class PaymentMethod(models.Model):
         ("MOBILE_MONEY", _("Mobile Money")),
     ]
 
-    STATUS_CHOICES = [
-        ("ACTIVE", _("Active")),
-        ("INACTIVE", _("Inactive")),
-        ("EXPIRED", _("Expired")),
-        ("BLOCKED", _("Blocked")),
-    ]
+    STATUS_CHOICES = PAYMENT_METHOD_STATUS_CHOICES
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
@@ -61,6 +76,22 @@ class PaymentMethod(models.Model):
 
     # General
     nickname = models.CharField(_("nickname"), max_length=100, blank=True)
+    # Stored copy of get_display_name() for list rendering
+    display_name = models.GeneratedField(
+        expression=Case(
+            When(
+                Q(method_type="CARD") & ~Q(card_last4=""),
+                then=Concat("card_brand", Value(" ****"), "card_last4"),
+            ),
+            When(
+                Q(method_type="BANK_TRANSFER") & ~Q(account_number=""),
+                then=Concat("bank_name", Value(" ****"), Right("account_number", 4)),
+            ),
+            default=F("method_type"),
+        ),
+        output_field=models.CharField(_("display name"), max_length=120),
+        db_persist=True,
+    )
     is_default = models.BooleanField(_("default method"), default=False)
     status = models.CharField(
         _("status"), max_length=20, choices=STATUS_CHOICES, default="ACTIVE"
@@ -78,15 +109,41 @@ class PaymentMethod(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = UserOwnedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Payment Method")
         verbose_name_plural = _("Payment Methods")
         db_table = "payments_payment_method"
         ordering = ["-is_default", "-created_at"]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(
+                    status__in=[
+                        value for value, _label in PAYMENT_METHOD_STATUS_CHOICES
+                    ]
+                ),
+                name="payment_method_status_valid",
+            ),
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=Q(is_default=True),
+                name="uniq_default_payment_method",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.method_type} - {self.nickname or self.get_display_name()}"
 
+    def make_default(self):
+        """Make this the user's only default payment method."""
+        with transaction.atomic():
+            PaymentMethod.objects.filter(user_id=self.user_id, is_default=True).exclude(
+                pk=self.pk
+            ).update(is_default=False)
+            PaymentMethod.objects.filter(pk=self.pk).update(is_default=True)
+        self.is_default = True
+
     def get_display_name(self):
         """Get display name for payment method."""
         if self.method_type == "CARD" and self.card_last4:
@@ -97,7 +154,39 @@ class PaymentMethod(models.Model):
             return self.method_type
 
 
-class PaymentTransaction(models.Model):
+def transaction_reference():
+    """
+    Default PaymentTransaction reference, so bulk_create fills it in too.
+
+    No uniqueness check is needed; see securebank.references.
+    """
+    return generate_reference("PAY")
+
+
+class PaymentTransactionQuerySet(StoredTotalQuerySet):
+    def with_related(self):
+        """Join the user, account and payment method serializers read."""
+        return self.select_related("user", "account", "payment_method")
+
+    def for_list(self):
+        """Leave out the wide columns that transaction lists never render."""
+        return self.defer(
+            "description", "paystack_payment_url", "user_agent", "metadata"
+        )
+
+
+PAYMENT_TRANSACTION_STATUS_CHOICES = [
+    ("INITIATED", _("Initiated")),
+    ("PENDING", _("Pending")),
+    ("PROCESSING", _("Processing")),
+    ("SUCCESS", _("Success")),
+    ("FAILED", _("Failed")),
+    ("CANCELLED", _("Cancelled")),
+    ("REFUNDED", _("Refunded")),
+]
+
+
+class PaymentTransaction(StoredTotalMixin, models.Model):
     """
     Payment transactions using various payment methods.
     """
@@ -111,18 +200,15 @@ class PaymentTransaction(models.Model):
         ("GIFTCARD_PURCHASE", _("Gift Card Purchase")),
     ]
 
-    STATUS_CHOICES = [
-        ("INITIATED", _("Initiated")),
-        ("PENDING", _("Pending")),
-        ("PROCESSING", _("Processing")),
-        ("SUCCESS", _("Success")),
-        ("FAILED", _("Failed")),
-        ("CANCELLED", _("Cancelled")),
-        ("REFUNDED", _("Refunded")),
-    ]
+    STATUS_CHOICES = PAYMENT_TRANSACTION_STATUS_CHOICES
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    reference = models.CharField(_("transaction reference"), max_length=50, unique=True)
+    reference = models.CharField(
+        _("transaction reference"),
+        max_length=50,
+        unique=True,
+        default=transaction_reference,
+    )
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="payment_transactions"
     )
@@ -189,57 +275,46 @@ class PaymentTransaction(models.Model):
     paid_at = models.DateTimeField(_("paid at"), null=True, blank=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = PaymentTransactionQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Payment Transaction")
         verbose_name_plural = _("Payment Transactions")
         db_table = "payments_payment_transaction"
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["reference"]),
             models.Index(fields=["status"]),
             models.Index(fields=["paystack_reference"]),
-            models.Index(fields=["user"]),
+            models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["user", "status"]),
+            models.Index(fields=["transaction_type", "status"]),
         ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(amount__gt=0), name="payment_transaction_amount_positive"
+            ),
+            models.CheckConstraint(
+                condition=Q(
+                    status__in=[
+                        value for value, _label in PAYMENT_TRANSACTION_STATUS_CHOICES
+                    ]
+                ),
+                name="payment_transaction_status_valid",
+            ),
+        ]
+
+    TOTAL_INPUTS = ("amount", "processing_fee", "service_fee")
 
     def __str__(self):
         return f"{self.reference} - {self.transaction_type} - {self.amount} {self.currency}"
 
-    def save(self, *args, **kwargs):
-        if not self.reference:
-            self.reference = self.generate_reference()
-
-        # Calculate total amount
-        self.total_amount = self.amount + self.processing_fee + self.service_fee
-
-        super().save(*args, **kwargs)
-
-    def generate_reference(self):
-        """Generate unique transaction reference."""
-        import random
-        import string
-
-        while True:
-            prefix = "PAY"
-            timestamp = (
-                str(int(self.created_at.timestamp() * 1000))
-                if self.created_at
-                else str(int(uuid.uuid4().int)[:10])
-            )
-            random_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=8)
-            )
-            reference = f"{prefix}{timestamp}{random_str}"
-
-            if not PaymentTransaction.objects.filter(reference=reference).exists():
-                return reference
-
     @property
     def is_successful(self):
         return self.status == "SUCCESS"
 
     @property
     def is_pending(self):
-        return self.status in ["INITIATED", "PENDING", "PROCESSING"]
+        return self.status in {"INITIATED", "PENDING", "PROCESSING"}
 
 
 class PaystackCustomer(models.Model):
@@ -260,6 +335,8 @@ class PaystackCustomer(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = UserOwnedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Paystack Customer")
         verbose_name_plural = _("Paystack Customers")
@@ -311,12 +388,57 @@ class PaystackWebhook(models.Model):
         indexes = [
             models.Index(fields=["event_type"]),
             models.Index(fields=["reference"]),
-            models.Index(fields=["processed"]),
+            # Only the retry backlog is indexed; processed rows are the bulk
+            # of the table and are never looked up by this column.
+            models.Index(
+                fields=["created_at"],
+                condition=Q(processed=False),
+                name="webhook_unprocessed_idx",
+            ),
         ]
 
+    BULK_BATCH_SIZE = 500
+
     def __str__(self):
         return f"{self.event_type} - {self.reference}"
 
+    @classmethod
+    def bulk_ingest(cls, events):
+        """
+        Store a batch of webhook events, given as dicts of field values,
+        with multi-row INSERTs.
+        """
+        return cls.objects.bulk_create(
+            [cls(**event) for event in events], batch_size=cls.BULK_BATCH_SIZE
+        )
+
+    @classmethod
+    def mark_processed(cls, ids):
+        """Flag a batch of webhooks as processed with one UPDATE."""
+        return cls.objects.filter(id__in=ids).update(
+            processed=True, processed_at=timezone.now()
+        )
+
+    @classmethod
+    def record_failures(cls, webhooks):
+        """
+        Count a failed attempt on each webhook and save their error_message
+        values, in batched UPDATEs.
+        """
+        for webhook in webhooks:
+            webhook.processing_attempts += 1
+        return cls.objects.bulk_update(
+            webhooks,
+            ["processing_attempts", "error_message"],
+            batch_size=cls.BULK_BATCH_SIZE,
+        )
+
+
+class RefundQuerySet(models.QuerySet):
+    def with_related(self):
+        """Join the user, original transaction and processing admin."""
+        return self.select_related("user", "original_transaction", "processed_by")
+
 
 class Refund(models.Model):
     """
@@ -364,11 +486,18 @@ class Refund(models.Model):
     processed_at = models.DateTimeField(_("processed at"), null=True, blank=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = RefundQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Refund")
         verbose_name_plural = _("Refunds")
         db_table = "payments_refund"
         ordering = ["-created_at"]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(amount__gt=0), name="refund_amount_positive"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.reference} - {self.amount} - {self.status}"
@@ -380,23 +509,7 @@ class Refund(models.Model):
 
     def generate_reference(self):
         """Generate unique refund reference."""
-        import random
-        import string
-
-        while True:
-            prefix = "REF"
-            timestamp = (
-                str(int(self.created_at.timestamp() * 1000))
-                if self.created_at
-                else str(int(uuid.uuid4().int)[:10])
-            )
-            random_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=8)
-            )
-            reference = f"{prefix}{timestamp}{random_str}"
-
-            if not Refund.objects.filter(reference=reference).exists():
-                return reference
+        return generate_reference("REF")
 
 
 class PaymentNotification(models.Model):
@@ -435,11 +548,33 @@ class PaymentNotification(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     read_at = models.DateTimeField(_("read at"), null=True, blank=True)
 
+    objects = UserOwnedQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Payment Notification")
         verbose_name_plural = _("Payment Notifications")
         db_table = "payments_notification"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "is_read"])]
+
+    BULK_BATCH_SIZE = 500
 
     def __str__(self):
         return f"{self.user.email} - {self.notification_type}"
+
+    @classmethod
+    def bulk_notify(cls, users, notification_type, title, message, transaction=None):
+        """Create the same notification for many users with multi-row INSERTs."""
+        return cls.objects.bulk_create(
+            [
+                cls(
+                    user=user,
+                    notification_type=notification_type,
+                    title=title,
+                    message=message,
+                    transaction=transaction,
+                )
+                for user in users
+            ],
+            batch_size=cls.BULK_BATCH_SIZE,
+        )
@@ -1,3 +1,184 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
-# Create your tests here.
+from .models import (
+    PaymentMethod,
+    PaymentNotification,
+    PaymentTransaction,
+    PaystackWebhook,
+)
+
+User = get_user_model()
+
+
+class PaymentTestData:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="payer", email="payer@example.com", password="pw"
+        )
+
+    def make_transaction(self, **kwargs):
+        fields = {
+            "user": self.user,
+            "transaction_type": "DEPOSIT",
+            "amount": Decimal("1000.00"),
+            "processing_fee": Decimal("15.00"),
+            "service_fee": Decimal("5.00"),
+        }
+        fields.update(kwargs)
+        return PaymentTransaction(**fields)
+
+
+class PaystackWebhookBulkTests(TestCase):
+    def ingest(self, count):
+        return PaystackWebhook.bulk_ingest(
+            {
+                "event_type": "charge.success",
+                "reference": f"REF{i}",
+                "data": {"amount": i},
+            }
+            for i in range(count)
+        )
+
+    def test_bulk_ingest_stores_every_event(self):
+        with self.assertNumQueries(1):
+            self.ingest(3)
+        self.assertEqual(PaystackWebhook.objects.filter(processed=False).count(), 3)
+
+    def test_mark_processed_flags_only_the_given_ids(self):
+        first, second = self.ingest(2)
+        self.assertEqual(PaystackWebhook.mark_processed([first.pk]), 1)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertTrue(first.processed)
+        self.assertIsNotNone(first.processed_at)
+        self.assertFalse(second.processed)
+
+    def test_record_failures_counts_attempts_and_saves_errors(self):
+        webhooks = list(
+            PaystackWebhook.objects.filter(pk__in=[w.pk for w in self.ingest(2)])
+        )
+        for webhook in webhooks:
+            webhook.error_message = "timeout"
+        PaystackWebhook.record_failures(webhooks)
+        PaystackWebhook.record_failures(webhooks)
+        self.assertEqual(
+            set(
+                PaystackWebhook.objects.values_list(
+                    "processing_attempts", "error_message"
+                )
+            ),
+            {(2, "timeout")},
+        )
+
+
+class PaymentNotificationBulkTests(PaymentTestData, TestCase):
+    def test_bulk_notify_creates_one_row_per_user(self):
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="pw"
+        )
+        with self.assertNumQueries(1):
+            PaymentNotification.bulk_notify(
+                [self.user, other], "REFUND_PROCESSED", "Refund", "Refunded"
+            )
+        self.assertCountEqual(
+            PaymentNotification.objects.values_list("user_id", flat=True),
+            [self.user.pk, other.pk],
+        )
+
+
+class PaymentMethodDefaultTests(PaymentTestData, TestCase):
+    def test_make_default_leaves_one_default_per_user(self):
+        first = PaymentMethod.objects.create(
+            user=self.user, method_type="USSD", is_default=True
+        )
+        second = PaymentMethod.objects.create(user=self.user, method_type="QR")
+        second.make_default()
+        self.assertTrue(second.is_default)
+        self.assertEqual(
+            list(
+                PaymentMethod.objects.filter(
+                    user=self.user, is_default=True
+                ).values_list("pk", flat=True)
+            ),
+            [second.pk],
+        )
+        first.refresh_from_db()
+        self.assertFalse(first.is_default)
+
+    def test_database_rejects_a_second_default(self):
+        PaymentMethod.objects.create(
+            user=self.user, method_type="USSD", is_default=True
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PaymentMethod.objects.create(
+                user=self.user, method_type="QR", is_default=True
+            )
+
+
+class PaymentMethodDisplayNameTests(PaymentTestData, TestCase):
+    def test_unsaved_method_computes_display_name(self):
+        method = PaymentMethod(
+            user=self.user, method_type="CARD", card_brand="Visa", card_last4="4242"
+        )
+        self.assertEqual(method.get_display_name(), "Visa ****4242")
+
+    def test_display_name_follows_unsaved_edits(self):
+        method = PaymentMethod.objects.create(
+            user=self.user, method_type="CARD", card_brand="Visa", card_last4="4242"
+        )
+        method = PaymentMethod.objects.get(pk=method.pk)
+        method.card_last4 = "1111"
+        self.assertEqual(method.get_display_name(), "Visa ****1111")
+        self.assertIn("Visa ****1111", str(method))
+
+    def test_stored_column_matches_get_display_name(self):
+        method = PaymentMethod.objects.create(
+            user=self.user,
+            method_type="BANK_TRANSFER",
+            bank_name="GTBank",
+            account_number="0123456789",
+        )
+        method.refresh_from_db()
+        self.assertEqual(method.display_name, method.get_display_name())
+
+
+class UserOwnedQuerySetTests(PaymentTestData, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        PaymentNotification.bulk_notify(
+            [cls.user, cls.user], "PAYMENT_SUCCESS", "Paid", "Payment received"
+        )
+
+    def test_default_manager_does_not_join_user(self):
+        self.assertNotIn("JOIN", str(PaymentNotification.objects.all().query))
+
+    def test_with_related_renders_str_without_extra_queries(self):
+        with self.assertNumQueries(1):
+            labels = [str(n) for n in PaymentNotification.objects.with_related()]
+        self.assertEqual(len(labels), 2)
+
+
+class PaymentCheckConstraintTests(PaymentTestData, TestCase):
+    def test_rejects_unknown_transaction_status(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.make_transaction(status="BOGUS").save()
+
+    def test_accepts_every_transaction_status_choice(self):
+        for status, _label in PaymentTransaction.STATUS_CHOICES:
+            self.make_transaction(status=status).save()
+
+    def test_rejects_non_positive_amount(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.make_transaction(amount=Decimal("0.00")).save()
+
+    def test_rejects_unknown_method_status(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PaymentMethod.objects.create(
+                user=self.user, method_type="USSD", status="BOGUS"
+            )
@@ -22,16 +22,7 @@ urlpatterns = [
     ),
     path("verify/", views.VerifyPaymentView.as_view(), name="verify_payment"),
     path("charge/", views.ChargePaymentView.as_view(), name="charge_payment"),
-    # Payment methods
-    path("methods/", views.PaymentMethodListView.as_view(), name="payment_methods"),
-    path(
-        "methods/add/", views.AddPaymentMethodView.as_view(), name="add_payment_method"
-    ),
-    path(
-        "methods/<uuid:pk>/remove/",
-        views.RemovePaymentMethodView.as_view(),
-        name="remove_payment_method",
-    ),
+    # Payment methods (list, create and delete are served by the router)
     path(
         "methods/<uuid:pk>/set-default/",
         views.SetDefaultPaymentMethodView.as_view(),
@@ -39,7 +30,6 @@ urlpatterns = [
     ),
     # Refunds
     path("refund/", views.RequestRefundView.as_view(), name="request_refund"),
-    path("refunds/", views.RefundListView.as_view(), name="refund_list"),
     # Notifications
     path(
         "notifications/",
@@ -0,0 +1,27 @@
+"""
+Shared admin helpers for SecureBank.
+"""
+
+
+class ListOnlyFieldsMixin:
+    """
+    Load only ``list_only_fields`` for changelist rows.
+
+    The narrowing is applied to the changelist alone, so change forms and
+    other admin views still fetch full rows in a single query.
+    """
+
+    list_only_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        changelist = super().get_changelist(request, **kwargs)
+        only_fields = self.list_only_fields
+        if not only_fields:
+            return changelist
+
+        class NarrowChangeList(changelist):
+            def get_queryset(self, request, exclude_parameters=None):
+                queryset = super().get_queryset(request, exclude_parameters)
+                return queryset.only(*only_fields)
+
+        return NarrowChangeList
@@ -0,0 +1,16 @@
+"""
+Transaction reference generation for SecureBank.
+"""
+
+import secrets
+import time
+
+
+def generate_reference(prefix):
+    """
+    Build a reference of the form <prefix><epoch ms><12 hex chars>.
+
+    48 random bits per millisecond make collisions negligible, so callers
+    rely on the column's unique constraint instead of checking first.
+    """
+    return f"{prefix}{time.time_ns() // 1_000_000}{secrets.token_hex(6).upper()}"
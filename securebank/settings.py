@@ -116,6 +116,12 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 AUTH_USER_MODEL = 'accounts.User'
+
+# Email login with the lockout check; ModelBackend supplies permissions
+AUTHENTICATION_BACKENDS = [
+    'accounts.authentication.EmailBackend',
+]
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -0,0 +1,82 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import models
+from django.test import SimpleTestCase
+
+from crypto.models import CryptoTransaction
+from giftcards.models import GiftCardTransaction
+from payments.models import PaymentTransaction
+from transactions.models import Transaction
+
+# (model, input values, expected total) for every model using StoredTotalMixin
+STORED_TOTALS = [
+    (
+        CryptoTransaction,
+        {"amount": Decimal("2"), "price_per_unit": Decimal("10.50")},
+        Decimal("21.00"),
+    ),
+    (
+        GiftCardTransaction,
+        {"amount": Decimal("85.00"), "fee": Decimal("1.50")},
+        Decimal("86.50"),
+    ),
+    (
+        PaymentTransaction,
+        {
+            "amount": Decimal("1000.00"),
+            "processing_fee": Decimal("15.00"),
+            "service_fee": Decimal("5.00"),
+        },
+        Decimal("1020.00"),
+    ),
+    (
+        Transaction,
+        {
+            "amount": Decimal("500.00"),
+            "fee": Decimal("10.00"),
+            "tax": Decimal("0.75"),
+        },
+        Decimal("510.75"),
+    ),
+]
+
+
+class StoredTotalTests(SimpleTestCase):
+    def test_save_fills_the_total(self):
+        for model, inputs, total in STORED_TOTALS:
+            with self.subTest(model=model.__name__):
+                obj = model(**inputs)
+                with mock.patch.object(models.Model, "save"):
+                    obj.save()
+                self.assertEqual(getattr(obj, model.TOTAL_FIELD), total)
+
+    def test_partial_save_of_an_input_writes_the_total(self):
+        for model, inputs, total in STORED_TOTALS:
+            with self.subTest(model=model.__name__):
+                obj = model(**inputs)
+                field = model.TOTAL_INPUTS[0]
+                with mock.patch.object(models.Model, "save") as save:
+                    obj.save(update_fields=[field])
+                self.assertEqual(
+                    save.call_args.kwargs["update_fields"], {field, model.TOTAL_FIELD}
+                )
+
+    def test_partial_save_of_other_fields_leaves_the_total_out(self):
+        for model, inputs, total in STORED_TOTALS:
+            with self.subTest(model=model.__name__):
+                obj = model(**inputs)
+                with mock.patch.object(models.Model, "save") as save:
+                    obj.save(update_fields=["status"])
+                self.assertEqual(save.call_args.kwargs["update_fields"], ["status"])
+
+    def test_bulk_create_fills_the_total(self):
+        for model, inputs, total in STORED_TOTALS:
+            with self.subTest(model=model.__name__):
+                objs = [model(**inputs), model(**inputs)]
+                with mock.patch.object(models.QuerySet, "bulk_create") as bulk_create:
+                    model.objects.bulk_create(objs)
+                created = bulk_create.call_args.args[0]
+                self.assertEqual(
+                    [getattr(obj, model.TOTAL_FIELD) for obj in created], [total, total]
+                )
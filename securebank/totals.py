@@ -0,0 +1,41 @@
+"""
+Stored totals for SecureBank's transaction models.
+"""
+
+from django.db import models
+
+
+class StoredTotalQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create skips save(), so fill the stored total here
+        objs = list(objs)
+        for obj in objs:
+            obj.fill_total()
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class StoredTotalMixin:
+    """
+    Shared save() for models that store TOTAL_FIELD, computed from the
+    TOTAL_INPUTS fields. Pair it with StoredTotalQuerySet so bulk_create
+    fills the total too.
+    """
+
+    TOTAL_FIELD = "total_amount"
+    TOTAL_INPUTS = ()
+
+    def save(self, *args, **kwargs):
+        self.fill_total()
+        # A partial save that changes an input must write the new total too
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(self.TOTAL_INPUTS).isdisjoint(
+            update_fields
+        ):
+            kwargs["update_fields"] = {*update_fields, self.TOTAL_FIELD}
+        super().save(*args, **kwargs)
+
+    def calculate_total(self):
+        return sum(getattr(self, name) for name in self.TOTAL_INPUTS)
+
+    def fill_total(self):
+        setattr(self, self.TOTAL_FIELD, self.calculate_total())
@@ -42,9 +42,11 @@ class AirtimeTopUpAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("user",)
     list_filter = ("network", "status", "provider", "created_at")
     search_fields = ("reference", "user__email", "phone_number")
     readonly_fields = ("id", "reference", "created_at", "updated_at")
+    raw_id_fields = ("user",)
 
 
 @admin.register(BillPayment)
@@ -58,9 +60,11 @@ class BillPaymentAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("user",)
     list_filter = ("bill_type", "status", "provider", "created_at")
     search_fields = ("reference", "user__email", "customer_name", "customer_id")
     readonly_fields = ("id", "reference", "created_at", "updated_at")
+    raw_id_fields = ("user",)
 
 
 @admin.register(SchoolFeePayment)
@@ -74,6 +78,7 @@ class SchoolFeePaymentAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("user",)
     list_filter = ("payment_type", "status", "created_at")
     search_fields = (
         "reference",
@@ -83,6 +88,7 @@ class SchoolFeePaymentAdmin(admin.ModelAdmin):
         "student_id",
     )
     readonly_fields = ("id", "reference", "created_at", "updated_at")
+    raw_id_fields = ("user",)
 
 
 @admin.register(ServiceTransaction)
@@ -95,9 +101,11 @@ class ServiceTransactionAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("user",)
     list_filter = ("service_type", "status", "created_at")
     search_fields = ("user__email", "service_id")
     readonly_fields = ("id", "created_at")
+    raw_id_fields = ("user",)
 
 
 @admin.register(SavedService)
@@ -110,6 +118,8 @@ class SavedServiceAdmin(admin.ModelAdmin):
         "is_favorite",
         "last_used",
     )
+    list_select_related = ("user", "provider")
     list_filter = ("service_type", "is_favorite", "created_at")
     search_fields = ("user__email", "provider__name", "nickname")
     readonly_fields = ("created_at", "updated_at")
+    raw_id_fields = ("user",)
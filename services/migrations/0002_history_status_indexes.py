@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_uuid7_primary_keys"),
+        ("services", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="airtimetopup",
+            index=models.Index(
+                fields=["user", "-created_at"], name="services_ai_user_id_ce7a69_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="airtimetopup",
+            index=models.Index(
+                fields=["status", "created_at"], name="services_ai_status_c30f24_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="billpayment",
+            index=models.Index(
+                fields=["user", "-created_at"], name="services_bi_user_id_4be5b4_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="billpayment",
+            index=models.Index(
+                fields=["status", "created_at"], name="services_bi_status_20e638_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="schoolfeepayment",
+            index=models.Index(
+                fields=["user", "-created_at"], name="services_sc_user_id_c11f30_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="schoolfeepayment",
+            index=models.Index(
+                fields=["status", "created_at"], name="services_sc_status_8e68ed_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0002_history_status_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="savedservice",
+            index=models.Index(
+                fields=["user", "-is_favorite", "last_used"],
+                name="services_sa_user_id_c9b197_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_uuid7_primary_keys"),
+        ("services", "0003_saved_service_ordering_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="airtimetopup",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    (
+                        "status__in",
+                        ["PENDING", "PROCESSING", "COMPLETED", "FAILED", "REFUNDED"],
+                    )
+                ),
+                name="airtime_topup_status_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="billpayment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    (
+                        "bill_type__in",
+                        [
+                            "ELECTRICITY",
+                            "WATER",
+                            "GAS",
+                            "INTERNET",
+                            "TV_SUBSCRIPTION",
+                            "INSURANCE",
+                            "TAX",
+                            "OTHER",
+                        ],
+                    )
+                ),
+                name="bill_payment_type_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="billpayment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    (
+                        "status__in",
+                        ["PENDING", "PROCESSING", "COMPLETED", "FAILED", "REFUNDED"],
+                    )
+                ),
+                name="bill_payment_status_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="schoolfeepayment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    (
+                        "payment_type__in",
+                        [
+                            "TUITION",
+                            "ACCOMMODATION",
+                            "LAB_FEES",
+                            "LIBRARY",
+                            "SPORTS",
+                            "EXAMINATION",
+                            "OTHER",
+                        ],
+                    )
+                ),
+                name="school_fee_payment_type_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="schoolfeepayment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    (
+                        "status__in",
+                        ["PENDING", "PROCESSING", "COMPLETED", "FAILED", "REFUNDED"],
+                    )
+                ),
+                name="school_fee_payment_status_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="serviceprovider",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    (
+                        "service_type__in",
+                        [
+                            "AIRTIME",
+                            "INTERNET",
+                            "ELECTRICITY",
+                            "TV_SUBSCRIPTION",
+                            "SCHOOL_FEES",
+                            "WATER",
+                            "GAS",
+                            "INSURANCE",
+                            "TAX",
+                        ],
+                    )
+                ),
+                name="service_provider_type_valid",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:30
+
+import uuid6
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0004_choice_check_constraints"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="airtimetopup",
+            name="id",
+            field=models.UUIDField(
+                default=uuid6.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="billpayment",
+            name="id",
+            field=models.UUIDField(
+                default=uuid6.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="schoolfeepayment",
+            name="id",
+            field=models.UUIDField(
+                default=uuid6.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="servicetransaction",
+            name="id",
+            field=models.UUIDField(
+                default=uuid6.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+    ]
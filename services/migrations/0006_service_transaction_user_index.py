@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0005_uuid7_primary_keys"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="servicetransaction",
+            index=models.Index(
+                fields=["user", "-created_at"], name="services_tr_user_id_6ae178_idx"
+            ),
+        ),
+    ]
@@ -3,34 +3,41 @@ Additional services models for SecureBank.
 Handles airtime top-up, school fees, bill payments, and other services.
 """
 
-import uuid
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
+from django.db.models import F, Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
+from uuid6 import uuid7
 
 from accounts.models import BankAccount
+from securebank.references import generate_reference
 
 User = get_user_model()
 
 
+# Module level so each Meta's CHECK constraint can be built from them
+PROVIDER_SERVICE_TYPE_CHOICES = [
+    ("AIRTIME", _("Airtime")),
+    ("INTERNET", _("Internet")),
+    ("ELECTRICITY", _("Electricity")),
+    ("TV_SUBSCRIPTION", _("TV Subscription")),
+    ("SCHOOL_FEES", _("School Fees")),
+    ("WATER", _("Water Bill")),
+    ("GAS", _("Gas Bill")),
+    ("INSURANCE", _("Insurance")),
+    ("TAX", _("Tax Payment")),
+]
+
+
 class ServiceProvider(models.Model):
     """
     Service providers for various payment services.
     """
 
-    SERVICE_TYPE_CHOICES = [
-        ("AIRTIME", _("Airtime")),
-        ("INTERNET", _("Internet")),
-        ("ELECTRICITY", _("Electricity")),
-        ("TV_SUBSCRIPTION", _("TV Subscription")),
-        ("SCHOOL_FEES", _("School Fees")),
-        ("WATER", _("Water Bill")),
-        ("GAS", _("Gas Bill")),
-        ("INSURANCE", _("Insurance")),
-        ("TAX", _("Tax Payment")),
-    ]
+    SERVICE_TYPE_CHOICES = PROVIDER_SERVICE_TYPE_CHOICES
 
     name = models.CharField(_("provider name"), max_length=200)
     service_type = models.CharField(
@@ -66,25 +73,116 @@ class ServiceProvider(models.Model):
         verbose_name = _("Service Provider")
         verbose_name_plural = _("Service Providers")
         db_table = "services_provider"
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(
+                    service_type__in=[
+                        value for value, _label in PROVIDER_SERVICE_TYPE_CHOICES
+                    ]
+                ),
+                name="service_provider_type_valid",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.service_type})"
 
+    @classmethod
+    def get_charge_terms(cls, provider_ids):
+        """
+        Map each provider id to its (charge_type, service_charge), loading
+        them all in one query.
+        """
+        return {
+            pk: (charge_type, service_charge)
+            for pk, charge_type, service_charge in cls.objects.filter(
+                pk__in=provider_ids
+            ).values_list("pk", "charge_type", "service_charge")
+        }
+
+    @classmethod
+    def calculate_charge(cls, provider_id, amount, charge_terms=None):
+        """
+        Service charge a provider levies on the given amount. Pass
+        charge_terms from get_charge_terms() to skip the lookup.
+        """
+        if charge_terms is None:
+            charge_terms = cls.get_charge_terms([provider_id])
+        charge_type, service_charge = charge_terms[provider_id]
+        if charge_type == "PERCENTAGE":
+            return (amount * service_charge) / 100
+        return service_charge
+
+
+SERVICE_PAYMENT_STATUS_CHOICES = [
+    ("PENDING", _("Pending")),
+    ("PROCESSING", _("Processing")),
+    ("COMPLETED", _("Completed")),
+    ("FAILED", _("Failed")),
+    ("REFUNDED", _("Refunded")),
+]
+
+
+class ServicePaymentQuerySet(models.QuerySet):
+    def for_list(self):
+        """Leave out the wide columns that payment history lists never render."""
+        return self.defer("user_agent", "notes")
+
+
+class ServicePaymentMixin:
+    """
+    Shared save() and bulk creation for service payment models, which
+    define generate_reference() and apply_charges().
+    """
 
-class AirtimeTopUp(models.Model):
+    BULK_BATCH_SIZE = 500
+    CHARGE_INPUTS = {"amount", "provider", "provider_id"}
+    CHARGE_OUTPUTS = ["service_charge", "total_amount"]
+
+    def save(self, *args, **kwargs):
+        if not self.reference:
+            self.reference = self.generate_reference()
+
+        # Partial saves that leave the charge inputs alone skip the recompute
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.apply_charges()
+        elif self.CHARGE_INPUTS.intersection(update_fields):
+            self.apply_charges()
+            kwargs["update_fields"] = {*update_fields, *self.CHARGE_OUTPUTS}
+
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def bulk_create_payments(cls, rows):
+        """
+        Create a batch of payments, given as dicts of field values, with
+        multi-row INSERTs, filling in what save() would.
+        """
+        payments = [cls(**row) for row in rows]
+        charge_terms = cls.load_charge_terms(payments)
+        for payment in payments:
+            if not payment.reference:
+                payment.reference = payment.generate_reference()
+            payment.apply_charges(charge_terms)
+        return cls.objects.bulk_create(payments, batch_size=cls.BULK_BATCH_SIZE)
+
+    @classmethod
+    def load_charge_terms(cls, payments):
+        """Charge terms for every provider in the batch, in one query."""
+        return ServiceProvider.get_charge_terms(
+            {payment.provider_id for payment in payments}
+        )
+
+
+class AirtimeTopUp(ServicePaymentMixin, models.Model):
     """
     Airtime top-up transactions.
     """
 
-    STATUS_CHOICES = [
-        ("PENDING", _("Pending")),
-        ("PROCESSING", _("Processing")),
-        ("COMPLETED", _("Completed")),
-        ("FAILED", _("Failed")),
-        ("REFUNDED", _("Refunded")),
-    ]
+    STATUS_CHOICES = SERVICE_PAYMENT_STATUS_CHOICES
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     reference = models.CharField(_("transaction reference"), max_length=50, unique=True)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="airtime_topups"
@@ -133,75 +231,65 @@ class AirtimeTopUp(models.Model):
     completed_at = models.DateTimeField(_("completed at"), null=True, blank=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = ServicePaymentQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Airtime Top-up")
         verbose_name_plural = _("Airtime Top-ups")
         db_table = "services_airtime_topup"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["status", "created_at"]),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(
+                    status__in=[
+                        value for value, _label in SERVICE_PAYMENT_STATUS_CHOICES
+                    ]
+                ),
+                name="airtime_topup_status_valid",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.reference} - {self.phone_number} - {self.amount}"
 
-    def save(self, *args, **kwargs):
-        if not self.reference:
-            self.reference = self.generate_reference()
-
-        # Calculate service charge and total
-        if self.provider.charge_type == "PERCENTAGE":
-            self.service_charge = (self.amount * self.provider.service_charge) / 100
-        else:
-            self.service_charge = self.provider.service_charge
-
+    def apply_charges(self, charge_terms=None):
+        """Set service_charge and total_amount from the provider's terms."""
+        self.service_charge = ServiceProvider.calculate_charge(
+            self.provider_id, self.amount, charge_terms
+        )
         self.total_amount = self.amount + self.service_charge
 
-        super().save(*args, **kwargs)
-
     def generate_reference(self):
         """Generate unique transaction reference."""
-        import random
-        import string
-
-        while True:
-            prefix = "AIR"
-            timestamp = (
-                str(int(self.created_at.timestamp() * 1000))
-                if self.created_at
-                else str(int(uuid.uuid4().int)[:10])
-            )
-            random_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=8)
-            )
-            reference = f"{prefix}{timestamp}{random_str}"
-
-            if not AirtimeTopUp.objects.filter(reference=reference).exists():
-                return reference
-
-
-class BillPayment(models.Model):
+        return generate_reference("AIR")
+
+
+BILL_PAYMENT_TYPE_CHOICES = [
+    ("ELECTRICITY", _("Electricity")),
+    ("WATER", _("Water")),
+    ("GAS", _("Gas")),
+    ("INTERNET", _("Internet")),
+    ("TV_SUBSCRIPTION", _("TV Subscription")),
+    ("INSURANCE", _("Insurance")),
+    ("TAX", _("Tax")),
+    ("OTHER", _("Other")),
+]
+
+
+class BillPayment(ServicePaymentMixin, models.Model):
     """
     General bill payment transactions.
     """
 
-    BILL_TYPE_CHOICES = [
-        ("ELECTRICITY", _("Electricity")),
-        ("WATER", _("Water")),
-        ("GAS", _("Gas")),
-        ("INTERNET", _("Internet")),
-        ("TV_SUBSCRIPTION", _("TV Subscription")),
-        ("INSURANCE", _("Insurance")),
-        ("TAX", _("Tax")),
-        ("OTHER", _("Other")),
-    ]
-
-    STATUS_CHOICES = [
-        ("PENDING", _("Pending")),
-        ("PROCESSING", _("Processing")),
-        ("COMPLETED", _("Completed")),
-        ("FAILED", _("Failed")),
-        ("REFUNDED", _("Refunded")),
-    ]
-
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    BILL_TYPE_CHOICES = BILL_PAYMENT_TYPE_CHOICES
+
+    STATUS_CHOICES = SERVICE_PAYMENT_STATUS_CHOICES
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     reference = models.CharField(_("transaction reference"), max_length=50, unique=True)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="bill_payments"
@@ -258,74 +346,70 @@ class BillPayment(models.Model):
     completed_at = models.DateTimeField(_("completed at"), null=True, blank=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = ServicePaymentQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Bill Payment")
         verbose_name_plural = _("Bill Payments")
         db_table = "services_bill_payment"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["status", "created_at"]),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(
+                    bill_type__in=[value for value, _label in BILL_PAYMENT_TYPE_CHOICES]
+                ),
+                name="bill_payment_type_valid",
+            ),
+            models.CheckConstraint(
+                condition=Q(
+                    status__in=[
+                        value for value, _label in SERVICE_PAYMENT_STATUS_CHOICES
+                    ]
+                ),
+                name="bill_payment_status_valid",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.reference} - {self.bill_type} - {self.customer_name}"
 
-    def save(self, *args, **kwargs):
-        if not self.reference:
-            self.reference = self.generate_reference()
-
-        # Calculate service charge and total
-        if self.provider.charge_type == "PERCENTAGE":
-            self.service_charge = (self.amount * self.provider.service_charge) / 100
-        else:
-            self.service_charge = self.provider.service_charge
-
+    def apply_charges(self, charge_terms=None):
+        """Set service_charge and total_amount from the provider's terms."""
+        self.service_charge = ServiceProvider.calculate_charge(
+            self.provider_id, self.amount, charge_terms
+        )
         self.total_amount = self.amount + self.service_charge
 
-        super().save(*args, **kwargs)
-
     def generate_reference(self):
         """Generate unique transaction reference."""
-        import random
-        import string
-
-        while True:
-            prefix = "BIL"
-            timestamp = (
-                str(int(self.created_at.timestamp() * 1000))
-                if self.created_at
-                else str(int(uuid.uuid4().int)[:10])
-            )
-            random_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=8)
-            )
-            reference = f"{prefix}{timestamp}{random_str}"
-
-            if not BillPayment.objects.filter(reference=reference).exists():
-                return reference
-
-
-class SchoolFeePayment(models.Model):
+        return generate_reference("BIL")
+
+
+SCHOOL_FEE_PAYMENT_TYPE_CHOICES = [
+    ("TUITION", _("Tuition Fee")),
+    ("ACCOMMODATION", _("Accommodation")),
+    ("LAB_FEES", _("Lab Fees")),
+    ("LIBRARY", _("Library Fees")),
+    ("SPORTS", _("Sports Fees")),
+    ("EXAMINATION", _("Examination Fees")),
+    ("OTHER", _("Other")),
+]
+
+
+class SchoolFeePayment(ServicePaymentMixin, models.Model):
     """
     School fee payment transactions.
     """
 
-    PAYMENT_TYPE_CHOICES = [
-        ("TUITION", _("Tuition Fee")),
-        ("ACCOMMODATION", _("Accommodation")),
-        ("LAB_FEES", _("Lab Fees")),
-        ("LIBRARY", _("Library Fees")),
-        ("SPORTS", _("Sports Fees")),
-        ("EXAMINATION", _("Examination Fees")),
-        ("OTHER", _("Other")),
-    ]
-
-    STATUS_CHOICES = [
-        ("PENDING", _("Pending")),
-        ("PROCESSING", _("Processing")),
-        ("COMPLETED", _("Completed")),
-        ("FAILED", _("Failed")),
-        ("REFUNDED", _("Refunded")),
-    ]
-
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    PAYMENT_TYPE_CHOICES = SCHOOL_FEE_PAYMENT_TYPE_CHOICES
+
+    STATUS_CHOICES = SERVICE_PAYMENT_STATUS_CHOICES
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     reference = models.CharField(_("transaction reference"), max_length=50, unique=True)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="school_fee_payments"
@@ -376,44 +460,55 @@ class SchoolFeePayment(models.Model):
     completed_at = models.DateTimeField(_("completed at"), null=True, blank=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = ServicePaymentQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("School Fee Payment")
         verbose_name_plural = _("School Fee Payments")
         db_table = "services_school_fee_payment"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["status", "created_at"]),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(
+                    payment_type__in=[
+                        value for value, _label in SCHOOL_FEE_PAYMENT_TYPE_CHOICES
+                    ]
+                ),
+                name="school_fee_payment_type_valid",
+            ),
+            models.CheckConstraint(
+                condition=Q(
+                    status__in=[
+                        value for value, _label in SERVICE_PAYMENT_STATUS_CHOICES
+                    ]
+                ),
+                name="school_fee_payment_status_valid",
+            ),
+        ]
+
+    # Fixed service charge for school fees
+    SERVICE_CHARGE = Decimal("50.00")
 
     def __str__(self):
         return f"{self.reference} - {self.school_name} - {self.student_name}"
 
-    def save(self, *args, **kwargs):
-        if not self.reference:
-            self.reference = self.generate_reference()
+    @classmethod
+    def load_charge_terms(cls, payments):
+        # The charge is fixed, so there are no provider terms to load
+        return None
 
-        # Calculate service charge and total
-        self.service_charge = Decimal("50.00")  # Fixed service charge for school fees
+    def apply_charges(self, charge_terms=None):
+        """Set the fixed service_charge and total_amount."""
+        self.service_charge = self.SERVICE_CHARGE
         self.total_amount = self.amount + self.service_charge
 
-        super().save(*args, **kwargs)
-
     def generate_reference(self):
         """Generate unique transaction reference."""
-        import random
-        import string
-
-        while True:
-            prefix = "SCH"
-            timestamp = (
-                str(int(self.created_at.timestamp() * 1000))
-                if self.created_at
-                else str(int(uuid.uuid4().int)[:10])
-            )
-            random_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=8)
-            )
-            reference = f"{prefix}{timestamp}{random_str}"
-
-            if not SchoolFeePayment.objects.filter(reference=reference).exists():
-                return reference
+        return generate_reference("SCH")
 
 
 class ServiceTransaction(models.Model):
@@ -421,7 +516,7 @@ class ServiceTransaction(models.Model):
     Generic service transaction for tracking all service payments.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="service_transactions"
     )
@@ -435,6 +530,7 @@ class ServiceTransaction(models.Model):
         verbose_name = _("Service Transaction")
         verbose_name_plural = _("Service Transactions")
         db_table = "services_transaction"
+        indexes = [models.Index(fields=["user", "-created_at"])]
 
     def __str__(self):
         return f"{self.user.email} - {self.service_type} - {self.amount}"
@@ -494,6 +590,14 @@ class SavedService(models.Model):
         db_table = "services_saved"
         unique_together = ["user", "provider", "service_type"]
         ordering = ["-is_favorite", "last_used"]
+        indexes = [models.Index(fields=["user", "-is_favorite", "last_used"])]
 
     def __str__(self):
         return f"{self.user.email} - {self.provider.name}"
+
+    @classmethod
+    def record_use(cls, pk):
+        """Bump usage_count and last_used in one UPDATE, safe under concurrency."""
+        return cls.objects.filter(pk=pk).update(
+            usage_count=F("usage_count") + 1, last_used=timezone.now()
+        )
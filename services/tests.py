@@ -1,3 +1,161 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import BankAccount
+
+from .models import (
+    AirtimeTopUp,
+    BillPayment,
+    SavedService,
+    SchoolFeePayment,
+    ServiceProvider,
+)
+
+User = get_user_model()
+
+
+class ServiceCheckConstraintTests(TestCase):
+    def make_provider(self, service_type, code):
+        return ServiceProvider.objects.create(
+            name="Provider", service_type=service_type, code=code
+        )
+
+    def test_provider_rejects_unknown_service_type(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.make_provider("BOGUS", "bogus")
+
+    def test_provider_accepts_every_service_type_choice(self):
+        for service_type, _label in ServiceProvider.SERVICE_TYPE_CHOICES:
+            self.make_provider(service_type, service_type.lower())
+
+    def test_constraints_list_exactly_the_field_choices(self):
+        cases = [
+            (ServiceProvider, "service_type", "service_provider_type_valid"),
+            (AirtimeTopUp, "status", "airtime_topup_status_valid"),
+            (BillPayment, "bill_type", "bill_payment_type_valid"),
+            (BillPayment, "status", "bill_payment_status_valid"),
+            (SchoolFeePayment, "payment_type", "school_fee_payment_type_valid"),
+            (SchoolFeePayment, "status", "school_fee_payment_status_valid"),
+        ]
+        for model, field, name in cases:
+            with self.subTest(constraint=name):
+                constraint = next(c for c in model._meta.constraints if c.name == name)
+                choices = model._meta.get_field(field).choices
+                self.assertEqual(
+                    constraint.condition.children,
+                    [(f"{field}__in", [value for value, _label in choices])],
+                )
+
+
+class ServiceTestData:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="payer", email="payer@example.com", password="pw"
+        )
+        cls.account = BankAccount.objects.create(user=cls.user)
+        cls.provider = ServiceProvider.objects.create(
+            name="MTN",
+            service_type="AIRTIME",
+            code="mtn",
+            charge_type="PERCENTAGE",
+            service_charge=Decimal("2.00"),
+        )
+
+    def topup_fields(self, **kwargs):
+        fields = {
+            "user": self.user,
+            "account": self.account,
+            "provider": self.provider,
+            "phone_number": "08030000000",
+            "network": "MTN",
+            "amount": Decimal("500.00"),
+        }
+        fields.update(kwargs)
+        return fields
+
+
+class ServiceChargeTests(ServiceTestData, TestCase):
+    def test_percentage_and_fixed_charges(self):
+        self.assertEqual(
+            ServiceProvider.calculate_charge(self.provider.pk, Decimal("500.00")),
+            Decimal("10.00"),
+        )
+        self.provider.charge_type = "FIXED"
+        self.provider.save()
+        self.assertEqual(
+            ServiceProvider.calculate_charge(self.provider.pk, Decimal("500.00")),
+            Decimal("2.00"),
+        )
+
+    def test_get_charge_terms_loads_every_provider_in_one_query(self):
+        other = ServiceProvider.objects.create(
+            name="Glo",
+            service_type="AIRTIME",
+            code="glo",
+            charge_type="FIXED",
+            service_charge=Decimal("5.00"),
+        )
+        with self.assertNumQueries(1):
+            terms = ServiceProvider.get_charge_terms([self.provider.pk, other.pk])
+        self.assertEqual(
+            terms,
+            {
+                self.provider.pk: ("PERCENTAGE", Decimal("2.00")),
+                other.pk: ("FIXED", Decimal("5.00")),
+            },
+        )
+
+
+class ServicePaymentSaveTests(ServiceTestData, TestCase):
+    def test_save_fills_reference_and_charges(self):
+        topup = AirtimeTopUp.objects.create(**self.topup_fields())
+        self.assertTrue(topup.reference.startswith("AIR"))
+        self.assertEqual(topup.service_charge, Decimal("10.00"))
+        self.assertEqual(topup.total_amount, Decimal("510.00"))
+
+    def test_partial_save_of_amount_writes_new_charges(self):
+        topup = AirtimeTopUp.objects.create(**self.topup_fields())
+        topup.amount = Decimal("1000.00")
+        topup.save(update_fields=["amount"])
+        topup.refresh_from_db()
+        self.assertEqual(topup.service_charge, Decimal("20.00"))
+        self.assertEqual(topup.total_amount, Decimal("1020.00"))
+
+    def test_partial_save_of_other_fields_skips_the_recompute(self):
+        topup = AirtimeTopUp.objects.create(**self.topup_fields())
+        topup.status = "COMPLETED"
+        with self.assertNumQueries(1):
+            topup.save(update_fields=["status"])
+
+    def test_bulk_create_payments_matches_save(self):
+        # One charge-terms lookup for the whole batch, then one INSERT
+        with self.assertNumQueries(2):
+            AirtimeTopUp.bulk_create_payments(
+                [self.topup_fields(), self.topup_fields(amount=Decimal("100.00"))]
+            )
+        self.assertCountEqual(
+            AirtimeTopUp.objects.values_list("service_charge", "total_amount"),
+            [
+                (Decimal("10.00"), Decimal("510.00")),
+                (Decimal("2.00"), Decimal("102.00")),
+            ],
+        )
+        self.assertEqual(
+            AirtimeTopUp.objects.filter(reference__startswith="AIR").count(), 2
+        )
+
+
+class SavedServiceTests(ServiceTestData, TestCase):
+    def test_record_use_counts_every_call(self):
+        saved = SavedService.objects.create(
+            user=self.user, provider=self.provider, service_type="AIRTIME"
+        )
+        SavedService.record_use(saved.pk)
+        SavedService.record_use(saved.pk)
+        saved.refresh_from_db()
+        self.assertEqual(saved.usage_count, 2)
+        self.assertIsNotNone(saved.last_used)
@@ -4,6 +4,7 @@ Admin configuration for transactions app.
 
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+from securebank.pagination import EstimatedCountPaginator
 from .models import (
     Transaction,
     TransactionLog,
@@ -24,9 +25,17 @@ class TransactionAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
+    list_select_related = ("source_account",)
     list_filter = ("transaction_type", "status", "currency", "priority", "created_at")
-    search_fields = ("reference", "user__email", "recipient_name", "description")
-    readonly_fields = ("id", "reference", "created_at", "updated_at")
+    search_fields = (
+        "reference",
+        "source_account__user__email",
+        "recipient_name",
+        "description",
+    )
+    readonly_fields = ("id", "reference", "total_amount", "created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         (
@@ -55,9 +64,12 @@ class TransactionAdmin(admin.ModelAdmin):
 @admin.register(TransactionLog)
 class TransactionLogAdmin(admin.ModelAdmin):
     list_display = ("transaction", "action", "old_status", "new_status", "created_at")
+    list_select_related = ("transaction",)
     list_filter = ("action", "created_at")
     search_fields = ("transaction__reference", "details")
     readonly_fields = ("created_at",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def has_add_permission(self, request):
         return False
@@ -73,6 +85,7 @@ class BeneficiaryAdmin(admin.ModelAdmin):
         "beneficiary_type",
         "is_favorite",
     )
+    list_select_related = ("user",)
     list_filter = ("beneficiary_type", "is_favorite", "created_at")
     search_fields = ("name", "account_number", "bank_name", "user__email")
     readonly_fields = ("id", "created_at", "updated_at")
@@ -87,6 +100,7 @@ class TransactionLimitAdmin(admin.ModelAdmin):
         "single_transfer_limit",
         "monthly_transfer_limit",
     )
+    list_select_related = ("user",)
     list_filter = ("tier", "created_at")
     search_fields = ("user__email",)
     readonly_fields = ("created_at", "updated_at")
@@ -102,6 +116,7 @@ class ScheduledTransactionAdmin(admin.ModelAdmin):
         "status",
         "next_execution",
     )
+    list_select_related = ("user",)
     list_filter = ("frequency", "status", "created_at")
     search_fields = ("user__email", "beneficiary_name", "beneficiary_account")
     readonly_fields = ("id", "created_at", "updated_at")
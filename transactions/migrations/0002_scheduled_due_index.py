@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_uuid7_primary_keys"),
+        ("transactions", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="scheduledtransaction",
+            index=models.Index(
+                fields=["status", "next_execution"],
+                name="transaction_status_203271_idx",
+            ),
+        ),
+    ]
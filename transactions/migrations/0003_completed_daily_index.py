@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_uuid7_primary_keys"),
+        ("transactions", "0002_scheduled_due_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("status", "COMPLETED")),
+                fields=["source_account", "created_at"],
+                name="txn_completed_daily_idx",
+            ),
+        ),
+    ]
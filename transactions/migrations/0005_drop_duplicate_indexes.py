@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0004_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="transaction_referen_923a88_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="transaction_source__e0cf02_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="transaction_destina_2160b5_idx",
+        ),
+    ]
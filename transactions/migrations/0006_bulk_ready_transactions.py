@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-15 07:35
+
+import transactions.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0005_drop_duplicate_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="transaction",
+            name="reference",
+            field=models.CharField(
+                default=transactions.models.transaction_reference,
+                max_length=50,
+                unique=True,
+                verbose_name="transaction reference",
+            ),
+        ),
+    ]
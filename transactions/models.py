@@ -3,20 +3,53 @@ Transaction models for SecureBank.
 Handles all types of financial transactions with proper security and auditing.
 """
 
-import uuid
+from datetime import datetime, time, timedelta
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Sum
+from django.db.models import Prefetch, Q, Sum
 from decimal import Decimal
+from uuid6 import uuid7
 
 from accounts.models import BankAccount
+from securebank.references import generate_reference
+from securebank.totals import StoredTotalMixin, StoredTotalQuerySet
 
 User = get_user_model()
 
 
-class Transaction(models.Model):
+def transaction_reference():
+    """
+    Default Transaction reference, so bulk_create fills it in too.
+
+    No uniqueness check is needed; see securebank.references.
+    """
+    return generate_reference("TXN")
+
+
+class TransactionQuerySet(StoredTotalQuerySet):
+    def with_related(self):
+        """Join the accounts and verifying user that transaction views render."""
+        return self.select_related(
+            "source_account", "destination_account", "verified_by"
+        )
+
+    def for_list(self):
+        """Leave out the wide columns that transaction lists never render."""
+        return self.defer("description", "narration", "user_agent")
+
+    def with_logs(self):
+        """Prefetch each transaction's audit trail, without its text columns."""
+        return self.prefetch_related(
+            Prefetch(
+                "logs", queryset=TransactionLog.objects.defer("details", "user_agent")
+            )
+        )
+
+
+class Transaction(StoredTotalMixin, models.Model):
     """
     Main transaction model for all financial operations.
     """
@@ -53,8 +86,13 @@ class Transaction(models.Model):
         ("URGENT", _("Urgent")),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    reference = models.CharField(_("transaction reference"), max_length=50, unique=True)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    reference = models.CharField(
+        _("transaction reference"),
+        max_length=50,
+        unique=True,
+        default=transaction_reference,
+    )
     transaction_type = models.CharField(
         _("transaction type"), max_length=20, choices=TRANSACTION_TYPE_CHOICES
     )
@@ -134,52 +172,30 @@ class Transaction(models.Model):
     completed_at = models.DateTimeField(_("completed at"), null=True, blank=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = TransactionQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Transaction")
         verbose_name_plural = _("Transactions")
         db_table = "transactions_transaction"
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["reference"]),
             models.Index(fields=["status"]),
             models.Index(fields=["transaction_type"]),
             models.Index(fields=["created_at"]),
-            models.Index(fields=["source_account"]),
-            models.Index(fields=["destination_account"]),
+            # Daily limit totals only ever sum completed rows
+            models.Index(
+                fields=["source_account", "created_at"],
+                condition=Q(status="COMPLETED"),
+                name="txn_completed_daily_idx",
+            ),
         ]
 
+    TOTAL_INPUTS = ("amount", "fee", "tax")
+
     def __str__(self):
         return f"{self.reference} - {self.transaction_type} - {self.amount} {self.currency}"
 
-    def save(self, *args, **kwargs):
-        if not self.reference:
-            self.reference = self.generate_reference()
-
-        # Calculate total amount
-        self.total_amount = self.amount + self.fee + self.tax
-
-        super().save(*args, **kwargs)
-
-    def generate_reference(self):
-        """Generate unique transaction reference."""
-        import random
-        import string
-
-        while True:
-            prefix = "TXN"
-            timestamp = (
-                str(int(self.created_at.timestamp() * 1000))
-                if self.created_at
-                else str(int(uuid.uuid4().int)[:10])
-            )
-            random_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=8)
-            )
-            reference = f"{prefix}{timestamp}{random_str}"
-
-            if not Transaction.objects.filter(reference=reference).exists():
-                return reference
-
     @property
     def is_completed(self):
         return self.status == "COMPLETED"
@@ -194,7 +210,7 @@ class Transaction(models.Model):
 
     def can_be_cancelled(self):
         """Check if transaction can be cancelled."""
-        return self.status in ["PENDING", "PROCESSING"]
+        return self.status in {"PENDING", "PROCESSING"}
 
     def can_be_reversed(self):
         """Check if transaction can be reversed."""
@@ -234,9 +250,21 @@ class TransactionLog(models.Model):
         db_table = "transactions_transaction_log"
         ordering = ["-created_at"]
 
+    BULK_BATCH_SIZE = 500
+
     def __str__(self):
         return f"{self.transaction.reference} - {self.action}"
 
+    @classmethod
+    def bulk_log(cls, entries):
+        """
+        Store a batch of log entries, given as dicts of field values, with
+        multi-row INSERTs.
+        """
+        return cls.objects.bulk_create(
+            [cls(**entry) for entry in entries], batch_size=cls.BULK_BATCH_SIZE
+        )
+
 
 class Beneficiary(models.Model):
     """
@@ -248,7 +276,7 @@ class Beneficiary(models.Model):
         ("EXTERNAL", _("External Transfer")),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="beneficiaries"
     )
@@ -357,45 +385,52 @@ class TransactionLimit(models.Model):
         verbose_name_plural = _("Transaction Limits")
         db_table = "transactions_transaction_limit"
 
+    # Transaction types that share each daily limit field
+    DAILY_LIMIT_GROUPS = {
+        "daily_transfer_limit": ("TRANSFER", "PAYMENT"),
+        "daily_withdrawal_limit": ("WITHDRAWAL",),
+        "daily_crypto_limit": ("CRYPTO_BUY", "CRYPTO_SELL"),
+    }
+
     def __str__(self):
         return f"{self.user.email} - {self.tier} Limits"
 
-    def check_daily_limit(self, transaction_type, amount):
-        """Check if amount exceeds daily limit for transaction type."""
-        from django.utils import timezone
-        from django.db.models import Sum
-
-        today = timezone.now().date()
-
-        if transaction_type in ["TRANSFER", "PAYMENT"]:
-            daily_total = Transaction.objects.filter(
-                source_account__user=self.user,
-                transaction_type__in=["TRANSFER", "PAYMENT"],
-                status="COMPLETED",
-                created_at__date=today,
-            ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-
-            return daily_total + amount <= self.daily_transfer_limit
-
-        elif transaction_type == "WITHDRAWAL":
-            daily_total = Transaction.objects.filter(
-                source_account__user=self.user,
-                transaction_type="WITHDRAWAL",
-                status="COMPLETED",
-                created_at__date=today,
-            ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-
-            return daily_total + amount <= self.daily_withdrawal_limit
-
-        elif transaction_type in ["CRYPTO_BUY", "CRYPTO_SELL"]:
-            daily_total = Transaction.objects.filter(
-                source_account__user=self.user,
-                transaction_type__in=["CRYPTO_BUY", "CRYPTO_SELL"],
-                status="COMPLETED",
-                created_at__date=today,
-            ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-
-            return daily_total + amount <= self.daily_crypto_limit
+    def get_daily_totals(self, date=None):
+        """
+        Return the day's completed totals keyed by daily limit field, from a
+        single aggregate query.
+        """
+        date = date or timezone.localdate()
+        # A range on created_at can use the index; __date wraps the column
+        day_start = timezone.make_aware(datetime.combine(date, time.min))
+        day_end = timezone.make_aware(
+            datetime.combine(date + timedelta(days=1), time.min)
+        )
+        totals = Transaction.objects.filter(
+            source_account__user_id=self.user_id,
+            status="COMPLETED",
+            created_at__gte=day_start,
+            created_at__lt=day_end,
+        ).aggregate(
+            **{
+                field: Sum("amount", filter=Q(transaction_type__in=types))
+                for field, types in self.DAILY_LIMIT_GROUPS.items()
+            }
+        )
+        return {field: total or Decimal("0.00") for field, total in totals.items()}
+
+    def check_daily_limit(self, transaction_type, amount, daily_totals=None):
+        """
+        Check if amount exceeds daily limit for transaction type.
+
+        Pass daily_totals from get_daily_totals() to check several amounts
+        against one query.
+        """
+        for field, types in self.DAILY_LIMIT_GROUPS.items():
+            if transaction_type in types:
+                if daily_totals is None:
+                    daily_totals = self.get_daily_totals()
+                return daily_totals[field] + amount <= getattr(self, field)
 
         return True
 
@@ -420,7 +455,7 @@ class ScheduledTransaction(models.Model):
         ("CANCELLED", _("Cancelled")),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="scheduled_transactions"
     )
@@ -453,6 +488,7 @@ class ScheduledTransaction(models.Model):
         verbose_name_plural = _("Scheduled Transactions")
         db_table = "transactions_scheduled_transaction"
         ordering = ["next_execution"]
+        indexes = [models.Index(fields=["status", "next_execution"])]
 
     def __str__(self):
         return f"{self.user.email} - {self.beneficiary_name} - {self.amount}"
@@ -1,3 +1,125 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import BankAccount
+
+from .models import Transaction, TransactionLimit, TransactionLog
+
+User = get_user_model()
+
+
+class TransactionTestData:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="holder", email="holder@example.com", password="pw"
+        )
+        cls.account = BankAccount.objects.create(user=cls.user)
+
+    def make_transaction(self, **kwargs):
+        fields = {
+            "transaction_type": "TRANSFER",
+            "source_account": self.account,
+            "amount": Decimal("500.00"),
+            "fee": Decimal("10.00"),
+            "tax": Decimal("0.75"),
+        }
+        fields.update(kwargs)
+        return Transaction(**fields)
+
+
+class TransactionBulkCreateTests(TransactionTestData, TestCase):
+    def test_bulk_create_writes_complete_rows(self):
+        Transaction.objects.bulk_create(
+            [self.make_transaction(), self.make_transaction(fee=Decimal("0.00"))],
+            batch_size=500,
+        )
+        rows = Transaction.objects.values_list("reference", "total_amount")
+        self.assertCountEqual(
+            [total for _ref, total in rows], [Decimal("510.75"), Decimal("500.75")]
+        )
+        self.assertTrue(all(ref.startswith("TXN") for ref, _total in rows))
+
+
+class TransactionLogTests(TransactionTestData, TestCase):
+    def test_bulk_log_writes_every_entry_in_one_insert(self):
+        first, second = (self.make_transaction(), self.make_transaction())
+        first.save()
+        second.save()
+        with self.assertNumQueries(1):
+            TransactionLog.bulk_log(
+                [
+                    {"transaction": first, "action": "CREATED"},
+                    {"transaction": first, "action": "COMPLETED"},
+                    {"transaction": second, "action": "CREATED"},
+                ]
+            )
+        self.assertEqual(TransactionLog.objects.filter(transaction=first).count(), 2)
+        self.assertEqual(TransactionLog.objects.filter(transaction=second).count(), 1)
+
+    def test_with_logs_prefetches_every_trail_in_one_query(self):
+        first, second = (self.make_transaction(), self.make_transaction())
+        first.save()
+        second.save()
+        TransactionLog.bulk_log(
+            [
+                {"transaction": first, "action": "CREATED"},
+                {"transaction": first, "action": "COMPLETED"},
+                {"transaction": second, "action": "CREATED"},
+            ]
+        )
+        with self.assertNumQueries(2):
+            counts = {
+                txn.pk: len(txn.logs.all()) for txn in Transaction.objects.with_logs()
+            }
+        self.assertEqual(counts, {first.pk: 2, second.pk: 1})
+
+
+class TransactionLimitTests(TransactionTestData, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.limits = TransactionLimit.objects.create(
+            user=cls.user, daily_transfer_limit=Decimal("1000.00")
+        )
+
+    def complete(self, transaction_type, amount, created_at=None):
+        txn = self.make_transaction(
+            transaction_type=transaction_type, amount=amount, status="COMPLETED"
+        )
+        txn.save()
+        if created_at:
+            Transaction.objects.filter(pk=txn.pk).update(created_at=created_at)
+
+    def test_daily_totals_group_types_and_skip_other_days(self):
+        self.complete("TRANSFER", Decimal("300.00"))
+        self.complete("PAYMENT", Decimal("200.00"))
+        self.complete("WITHDRAWAL", Decimal("50.00"))
+        self.complete("TRANSFER", Decimal("999.00"), timezone.now() - timedelta(days=2))
+        self.make_transaction(amount=Decimal("400.00")).save()  # still pending
+        with self.assertNumQueries(1):
+            totals = self.limits.get_daily_totals()
+        self.assertEqual(
+            totals,
+            {
+                "daily_transfer_limit": Decimal("500.00"),
+                "daily_withdrawal_limit": Decimal("50.00"),
+                "daily_crypto_limit": Decimal("0.00"),
+            },
+        )
+
+    def test_check_daily_limit(self):
+        self.complete("TRANSFER", Decimal("600.00"))
+        self.assertTrue(self.limits.check_daily_limit("PAYMENT", Decimal("400.00")))
+        self.assertFalse(self.limits.check_daily_limit("TRANSFER", Decimal("400.01")))
+        self.assertTrue(self.limits.check_daily_limit("REFUND", Decimal("99999")))
 
-# Create your tests here.
+    def test_check_daily_limit_reuses_given_totals(self):
+        totals = self.limits.get_daily_totals()
+        with self.assertNumQueries(0):
+            self.limits.check_daily_limit("TRANSFER", Decimal("1.00"), totals)
+            self.limits.check_daily_limit("WITHDRAWAL", Decimal("1.00"), totals)